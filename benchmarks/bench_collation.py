@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""정렬 키 비교: 예전 lambda (x['title'].lower()) 대 대조 키 (collation_key, 링크별 캐시)
+
+  키 생성   - 링크마다 키를 한 번 만드는 시간 (lower / fold / collation_key)
+  정렬      - 예전 방식은 정렬할 때마다 키를 다시 만들고, 대조 키는 LinkView 에 둔 키를
+              쓴다 (첫 정렬은 키 생성 포함). 정렬 목록처럼 (키, id) 를 모아 두면 튜플 비교만 함
+  정렬 목록 - SortedOrders 를 한 번 만든 뒤 정렬 방식을 바꾸고 첫 페이지를 읽는 시간
+
+마지막에 예전 순서와 대조 키 순서가 다른 예를 보인다.
+
+사용법: python benchmarks/bench_collation.py [링크 수]
+"""
+import sys
+import time
+import random
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from link_collation import collation_key
+from link_search import SortedOrders, ViewCache, fold
+from link_store import link_sort_fields
+
+SYLLABLES = '가나다라마바사아자차카타파하고노도로모보소오조초코토포호산내음춧루청결농업바람김장여행건강교육쇼핑'
+LATIN = ['Naver', 'naver', 'Blog', 'shop', 'Café', 'YouTube', 'ＮＡＶＥＲ', 'ㅅㄴㅇ', 'ㄱ']
+SAMPLES = ['제목10', '제목2', '제목 2', 'Apple', 'apple', 'Äpple', 'banana', 'Zeta', '가나', '각', 'ㄱ', '가',
+           '[공지] 하나', '007', '7', '123', 'ＮＡＶＥＲ', 'naver.com']
+
+
+def make_links(n):
+    rng = random.Random(n)
+
+    def word():
+        roll = rng.random()
+        if roll < 0.15:
+            return rng.choice(LATIN)
+        if roll < 0.3:
+            return str(rng.randrange(1, 2000))
+        return ''.join(rng.choices(SYLLABLES, k=rng.randint(2, 4)))
+
+    return [
+        {
+            'id': i + 1,
+            'title': ' '.join(word() for _ in range(3)),
+            'description': '',
+            'url': f'https://example{i % 97}.com/{word()}/{i}',
+            'category': '0',
+        }
+        for i in range(n)
+    ]
+
+
+def best_ms(func, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    links = make_links(n)
+    print(f'링크 {n:,}개\n')
+
+    print(f'{"키 생성":<24}{"ms":>10}{"링크당 us":>12}')
+    for name, key in (('lower()', str.lower), ('fold', fold), ('collation_key', collation_key)):
+        ms, _ = best_ms(lambda: [key(link['title']) for link in links])
+        print(f'{name:<24}{ms:>10.1f}{ms * 1000 / n:>12.2f}')
+
+    print(f'\n{"정렬 (제목)":<24}{"ms":>10}')
+    ms, _ = best_ms(lambda: sorted(links, key=lambda x: x['title'].lower()))
+    print(f'{"예전 lambda":<24}{ms:>10.1f}')
+    views = ViewCache()
+    for link in links:
+        views(link)
+    start = time.perf_counter()
+    sorted(links, key=lambda link: views(link).collation('title'))
+    print(f'{"대조 키 (첫 정렬)":<24}{(time.perf_counter() - start) * 1000:>10.1f}')
+    ms, _ = best_ms(lambda: sorted(links, key=lambda link: views(link).collation('title')))
+    print(f'{"대조 키 (LinkView 조회)":<24}{ms:>10.1f}')
+    pairs = [(views(link).title_key, link['id']) for link in links]
+    ms, _ = best_ms(lambda: sorted(pairs))
+    print(f'{"대조 키 (튜플 비교만)":<24}{ms:>10.1f}')
+
+    by_id = {link['id']: link for link in links}
+    start = time.perf_counter()
+    orders = SortedOrders.build(link_sort_fields(links), views)
+    print(f'{"정렬 목록 생성":<24}{(time.perf_counter() - start) * 1000:>10.1f}')
+    for sort in ('title_desc', 'url_asc'):
+        ms, _ = best_ms(lambda: orders.links(sort, by_id)[:20])
+        print(f'{"정렬 목록 " + sort:<24}{ms:>10.3f}')
+
+    print('\n예전 순서: ' + ', '.join(sorted(SAMPLES, key=str.lower)))
+    print('대조 키:   ' + ', '.join(sorted(SAMPLES, key=collation_key)))
+
+
+if __name__ == '__main__':
+    main()
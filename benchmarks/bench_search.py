@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""검색 속도 비교
+
+  순차      - create_search_function 클로저로 모든 링크 검사
+  컴파일    - compile_search_function 으로 만든 함수 하나로 모든 링크 검사
+  색인      - bigram 색인으로 후보를 좁힌 뒤 컴파일된 함수로 검증
+  비트맵    - BitsetEvaluator (색인 없이 검색어마다 전체 검사 후 비트 연산)
+  비트맵+색인 - BitsetEvaluator (검색어 후보를 색인으로 좁혀 검증 후 비트 연산, cat: 은 분류 비트맵)
+
+오타 검색어는 순차 (모든 링크의 단어와 편집 거리 계산) 와 비트맵+색인 (단어 색인으로 후보
+단어를 좁힘) 을 검색 한 번의 예산 (FUZZY_BUDGET_MS) 과 비교한다.
+
+이어서 검색어 길이별 토큰 분리 시간 (예전 방식 대 정규식) 과 parse 캐시 효과를 잰다.
+
+사용법: python benchmarks/bench_search.py [링크 수]
+"""
+import sys
+import time
+import random
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from link_search import SearchParser, BigramIndex, BitsetEvaluator, CategoryIndex, ViewCache
+
+QUERIES = [
+    '산내음',
+    '고춧가루 AND 김장',
+    '"청결 고춧가루"',
+    '바람 OR 여행',
+    'naver AND NOT blog',
+    '(농업 OR 건강 OR 교육) AND NOT (shop OR 쇼핑)',
+    '(산내음 OR 바람 OR 김장) AND NOT (naver OR blog)',
+    '((농업 OR 건강) AND (교육 OR 여행)) OR NOT (고춧가루 OR 청결 OR 쇼핑 OR shop)',
+    'ㅅㄴㅇ',
+    'ㄱㅊㄱㄹ AND NOT ㄱㅈ',
+    'title:고춧가루',
+    'url:example5.',
+    'desc:김장 AND NOT title:김장',
+    'cat:농업 AND 바람',
+    'cat:4 OR cat:생활',
+]
+# 오타 허용 검색 - ~ 를 붙이거나, 일치하는 링크가 없어 자동으로 오타 허용 검색이 되는 검색어
+FUZZY_QUERIES = [
+    '~고춧가로',
+    '고춧가로',
+    '~nver',
+    '김장 AND 고춧가로',
+    '~examlpe5',
+]
+# 입력 중 검색 한 번에 쓸 수 있는 시간 (ms)
+FUZZY_BUDGET_MS = 50
+SYLLABLES = '가나다라마바사아자차카타파하고노도로모보소오조초코토포호산내음춧루청결농업바람김장여행건강교육쇼핑'
+WORDS = ['산내음', '고춧가루', '청결', '농업', '바람', '김장', 'naver', 'shop', 'blog', '여행', '건강', '교육', '쇼핑']
+
+
+def make_links(n):
+    rng = random.Random(n)
+
+    def word():
+        # 대부분은 무작위 음절 단어, 가끔 실제 검색어가 섞임
+        if rng.random() < 0.05:
+            return rng.choice(WORDS)
+        return ''.join(rng.choices(SYLLABLES, k=rng.randint(2, 4)))
+
+    return [
+        {
+            'id': i + 1,
+            'title': ' '.join(word() for _ in range(3)),
+            'description': ' '.join(word() for _ in range(10)),
+            'url': f'https://example{i % 97}.com/{word()}/{i}',
+            'category': str(rng.randrange(11)),
+        }
+        for i in range(n)
+    ]
+
+
+def legacy_tokenize(query):
+    """예전 SearchParser.tokenize - 위치마다 query[i:].upper() 를 만들어 길이의 제곱에 비례"""
+    if not query or not query.strip():
+        return []
+
+    tokens = []
+    i = 0
+    length = len(query)
+
+    while i < length:
+        if query[i].isspace():
+            i += 1
+            continue
+
+        if query[i] == '(':
+            tokens.append('(')
+            i += 1
+            continue
+        elif query[i] == ')':
+            tokens.append(')')
+            i += 1
+            continue
+
+        upper_query = query[i:].upper()
+        if upper_query.startswith('OR'):
+            tokens.append('OR')
+            i += 2
+            continue
+        elif upper_query.startswith('AND'):
+            tokens.append('AND')
+            i += 3
+            continue
+        elif upper_query.startswith('NOT'):
+            tokens.append('NOT')
+            i += 3
+            continue
+
+        if query[i] == '"':
+            j = i + 1
+            while j < length and query[j] != '"':
+                j += 1
+            if j < length:
+                tokens.append(query[i+1:j].strip())
+                i = j + 1
+            else:
+                tokens.append(query[i+1:].strip())
+                i = length
+        else:
+            j = i
+            while j < length and not query[j].isspace() and query[j] not in '()':
+                j += 1
+            tokens.append(query[i:j].strip())
+            i = j
+
+    return [t for t in tokens if t]
+
+
+def best_ms(func, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    links = make_links(n)
+    by_id = {link['id']: link for link in links}
+    views = ViewCache()
+    for link in links:
+        views(link)
+
+    start = time.perf_counter()
+    index = BigramIndex.build(links)
+    categories = CategoryIndex.build((link['id'], link['category']) for link in links)
+    print(f'링크 {n:,}개, 색인 생성 {(time.perf_counter() - start) * 1000:.0f}ms, 조각 {len(index.postings):,}개\n')
+
+    print(f'{"검색어":<60}{"결과":>8}{"순차":>10}{"컴파일":>10}{"색인":>10}{"비트맵":>10}{"비트맵+색인":>12}  (ms)')
+    for query in QUERIES:
+        postfix = SearchParser.postfix(query)
+        func = SearchParser.create_search_function(postfix)
+        compiled = SearchParser.compile_search_function(postfix)
+
+        def scan():
+            return [link for link in links if func(views(link))]
+
+        def compiled_scan():
+            return [link for link in links if compiled(views(link))]
+
+        def indexed():
+            candidates = index.candidates_for(postfix)
+            pool = links if candidates is None else [by_id[i] for i in sorted(candidates)]
+            return [link for link in pool if compiled(views(link))]
+
+        def bitset():
+            return BitsetEvaluator(by_id, views).search(postfix)
+
+        def bitset_indexed():
+            return BitsetEvaluator(by_id, views, index, categories).search(postfix)
+
+        scan_ms, expected = best_ms(scan)
+        timings = []
+        for runner in (compiled_scan, indexed, bitset, bitset_indexed):
+            ms, result = best_ms(runner)
+            assert result == expected, (query, runner.__name__)
+            timings.append(ms)
+        print(f'{query:<60}{len(expected):>8,}{scan_ms:>10.1f}' + ''.join(f'{ms:>10.1f}' for ms in timings[:3]) + f'{timings[3]:>12.1f}')
+
+    print(f'\n{"오타 검색어":<40}{"결과":>8}{"순차":>10}{"비트맵+색인":>12}{"예산":>8}  (ms)')
+    for query in FUZZY_QUERIES:
+        postfix = SearchParser.postfix(query)
+        evaluator = BitsetEvaluator(by_id, views, index, categories)
+        evaluator.search(postfix)
+        # 자동 오타 허용 검색이면 바뀐 식으로 순차 검사
+        func = SearchParser.create_search_function(evaluator.fuzzy_postfix or postfix)
+
+        def fuzzy_scan():
+            return [link for link in links if func(views(link))]
+
+        def fuzzy_indexed():
+            return BitsetEvaluator(by_id, views, index, categories).search(postfix)
+
+        scan_ms, expected = best_ms(fuzzy_scan, repeat=1)
+        indexed_ms, result = best_ms(fuzzy_indexed)
+        assert result == expected, query
+        verdict = '통과' if indexed_ms <= FUZZY_BUDGET_MS else '초과'
+        print(f'{query:<40}{len(expected):>8,}{scan_ms:>10.1f}{indexed_ms:>12.1f}{FUZZY_BUDGET_MS:>8} {verdict}')
+
+    print(f'\n{"검색어 길이":<12}{"예전 토큰 분리":>16}{"정규식":>10}  (ms)')
+    for words in (10, 100, 1000, 5000):
+        query = ' AND '.join(f'"단어{i} 산내음"' if i % 3 == 0 else f'(word{i} OR 바람)' for i in range(words))
+        legacy_ms, expected = best_ms(lambda: legacy_tokenize(query), repeat=3)
+        regex_ms, result = best_ms(lambda: SearchParser.tokenize(query), repeat=3)
+        assert result == expected
+        print(f'{len(query):<12,}{legacy_ms:>16.2f}{regex_ms:>10.2f}')
+
+    query = QUERIES[-1]
+    uncached_ms, _ = best_ms(lambda: SearchParser.compile_search_function(
+        SearchParser.infix_to_postfix(SearchParser.tokenize(query))), repeat=20)
+    SearchParser.parse(query)
+    cached_ms, _ = best_ms(lambda: SearchParser.parse(query), repeat=20)
+    print(f'\nparse: 매번 파싱/컴파일 {uncached_ms * 1000:.0f}µs, 캐시 {cached_ms * 1000:.1f}µs')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""시작 시간 / 메모리 비교: links.json (json.load) 대 links.bin (메모리 매핑)
+
+사용법: python benchmarks/bench_snapshot.py [링크 수 ...]
+각 측정은 별도 프로세스에서 실행해 최대 RSS 가 섞이지 않게 한다.
+"""
+import os
+import sys
+import json
+import time
+import random
+import tempfile
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from link_store import BinarySnapshot
+
+SIZES = [10_000, 100_000, 1_000_000]
+WORDS = ['산내음', '고춧가루', '청결', '농업', '바람', '김장', 'naver', 'shop', 'blog', '여행', '건강', '교육']
+
+
+def make_links(n):
+    rng = random.Random(n)
+    return [
+        {
+            'id': i + 1,
+            'title': ' '.join(rng.choices(WORDS, k=3)) + f' {i}',
+            'description': ' '.join(rng.choices(WORDS, k=12)),
+            'url': f'https://example{i % 97}.com/{rng.choice(WORDS)}/{i}',
+            'category': str(rng.randrange(11)),
+        }
+        for i in range(n)
+    ]
+
+
+def rss_kb():
+    """현재 프로세스의 최대 RSS (KB)
+
+    ru_maxrss 는 exec 이전 부모 프로세스의 값까지 이어받으므로
+    리눅스에서는 프로세스별로 새로 시작하는 VmHWM 을 쓴다.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def measure(kind, directory):
+    """자식 프로세스: 불러오기 + 첫 화면 20개 접근까지의 시간과 RSS 증가량 출력"""
+    json_path = Path(directory) / 'links.json'
+    base = rss_kb()
+    start = time.perf_counter()
+    if kind == 'json':
+        with open(json_path, 'r', encoding='utf-8') as f:
+            links = json.load(f)
+    else:
+        from link_store import LazyLinkList
+        snapshot = BinarySnapshot(Path(directory) / 'links.bin')
+        assert snapshot.matches(json_path)
+        links = LazyLinkList(snapshot)
+    first_page = links[:20]
+    elapsed = time.perf_counter() - start
+    assert len(first_page) == 20
+    print(json.dumps({'ms': elapsed * 1000, 'rss_mb': (rss_kb() - base) / 1024}))
+
+
+def run(kind, directory):
+    out = subprocess.check_output([sys.executable, __file__, '--child', kind, directory])
+    return json.loads(out)
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        measure(sys.argv[2], sys.argv[3])
+        return
+
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    print(f'{"링크 수":>10} | {"JSON ms":>10} {"JSON MB":>9} | {"BIN ms":>8} {"BIN MB":>8} | 파일 크기 (JSON / BIN)')
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            links = make_links(n)
+            json_path = Path(directory) / 'links.json'
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(links, f, ensure_ascii=False, indent=2)
+            BinarySnapshot.write(Path(directory) / 'links.bin', links, json_path)
+            del links
+
+            j = run('json', directory)
+            b = run('bin', directory)
+            json_mb = os.path.getsize(json_path) / 1e6
+            bin_mb = os.path.getsize(Path(directory) / 'links.bin') / 1e6
+            print(f'{n:>10,} | {j["ms"]:>10.1f} {j["rss_mb"]:>9.1f} | {b["ms"]:>8.1f} {b["rss_mb"]:>8.1f} | '
+                  f'{json_mb:.1f}MB / {bin_mb:.1f}MB')
+
+
+if __name__ == '__main__':
+    main()
@@ -18,12 +18,15 @@ source.include_exts = py,png,jpg,kv,txt,json
 # (list) Source files to exclude
 source.exclude_exts = spec
 
+# (list) List of directory to exclude (let empty to not exclude anything)
+source.exclude_dirs = benchmarks
+
 # (str) Application versioning
 version = 1.0.0
 version.code = 1
 
 # (list) Application requirements - pyjnius 유지 (클립보드용)
-requirements = python3,kivy==2.1.0,pyjnius,android
+requirements = python3,kivy==2.1.0,pyjnius,android,sqlite3
 
 # (str) Icon of the application
 icon.filename = %(source.dir)s/res/drawable/icon.png
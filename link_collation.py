@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""정렬용 대조 키 (한글/라틴 문자/숫자가 섞인 제목과 주소)
+
+collation_key(text) 는 문자열 하나라 정렬은 문자열 (링크 id 와 묶으면 튜플) 비교만 한다.
+  - 공백/구두점 < 숫자 < 라틴 문자 < 그 밖의 문자 < 한글 < 한자
+  - 숫자는 값 순서 (제목2 < 제목10), 앞의 0 은 같은 값으로 봄
+  - 라틴 문자는 대소문자와 악센트를 무시 (Apple = apple = Äpple), 전각 문자는 반각으로
+  - 한글은 음절을 초성/중성/종성 자모로 풀어 비교 - 받침 없는 음절이 받침 있는 음절
+    앞에 오고 ('가나' < '각'), 낱자 (ㄱ) 는 그 초성으로 시작하는 음절 앞에 온다
+비교 문자열 뒤에 '\0' 과 원래 문자열 (NFC) 을 붙여, 비교 문자열이 같으면 원래 문자열로
+순서를 정한다 ('\0' 은 비교 문자열의 어떤 글자보다 앞서므로 짧은 쪽이 먼저인 것은 그대로).
+
+NFKD 가 한글 음절을 조합형 자모로 풀면 초성 (U+1100~) 이 종성 (U+11A8~) 보다 앞서므로
+코드 순서 비교가 곧 음절 단위 비교가 된다. 키는 만들 때 비용이 있으므로 링크마다 한 번만
+만들어 LinkView 에 둔다 (LinkView.collation).
+"""
+import re
+import unicodedata
+
+CollationKey = str
+
+# 숫자/문자 사이나 뒤에 오는 ASCII 구두점 (: ; < = > ? @ [ \ ] ^ _ ` { | } ~) 은 0x01~ 로
+# 옮겨 공백 (0x20), !"#...- ./ 와 함께 숫자보다 앞서게 함
+_PUNCT_TABLE = {ord(char): chr(1 + i) for i, char in enumerate(':;<=>?@[\\]^_`{|}~')}
+# 숫자 토큰은 '0' + 자릿수 글자 + 앞의 0 을 뺀 숫자 - 자릿수부터 비교하므로 값 순서가 됨
+_TOKEN_RE = re.compile(r'([0-9]+)|([:-@\\[-`{-~]+)')
+# NFKD 로 떨어져 나온 결합 부호 (악센트)
+_COMBINING_RE = re.compile('[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]')
+
+
+def _token(match: 're.Match') -> str:
+    run = match.group()
+    if match.lastindex == 2:
+        return run.translate(_PUNCT_TABLE)
+    digits = run.lstrip('0') or '0'
+    return '0' + chr(0x30 + len(digits)) + digits
+
+
+def collation_key(text: str) -> CollationKey:
+    """정렬 키 - 키끼리의 문자열 비교가 곧 정렬 순서"""
+    text = unicodedata.normalize('NFC', text)
+    key = unicodedata.normalize('NFKD', text).casefold()
+    if not key.isascii():
+        key = _COMBINING_RE.sub('', key)
+    key = _TOKEN_RE.sub(_token, key)
+    return key + '\0' + text
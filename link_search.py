@@ -0,0 +1,1562 @@
+# -*- coding: utf-8 -*-
+"""산내음 링크 검색 - 검색어 파서, 글자 bigram 역색인, 오타 허용 단어 색인, 비트맵 평가기, 관련도 순위,
+백그라운드 검색 작업"""
+import re
+import math
+import time
+import heapq
+import logging
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from array import array
+from bisect import bisect_left, insort
+from operator import add, itemgetter
+from typing import List, Dict, Any, Callable, Optional, Iterable, Iterator, Mapping, Sequence, Set, Tuple
+
+from link_collation import CollationKey, collation_key
+
+# kivy.logger.Logger 와 같은 'kivy' 로거 (Kivy 없이도 임포트 가능하도록)
+Logger = logging.getLogger('kivy')
+
+# ============================================================
+# 검색용 필드 보기 (소문자 + NFC 정규화, 링크별 캐시)
+# ============================================================
+def fold(text: str) -> str:
+    """검색/정렬 비교용 문자열 (소문자, NFC - 자모가 풀어진 한글도 완성형과 같게)"""
+    return unicodedata.normalize('NFC', text.lower())
+
+
+# 한글 음절의 초성 (호환 자모). 음절 코드 = 0xAC00 + 초성 * 588 + 중성 * 28 + 종성
+CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+_CHOSEONG_TABLE = {code: CHOSEONG[(code - 0xAC00) // 588] for code in range(0xAC00, 0xD7A4)}
+_CHOSEONG_SET = frozenset(CHOSEONG)
+
+
+def initials(text: str) -> str:
+    """한글 음절을 초성으로 바꾼 문자열 (산내음 → ㅅㄴㅇ, 다른 글자는 그대로)"""
+    return text.translate(_CHOSEONG_TABLE)
+
+
+def is_choseong(term: str) -> bool:
+    """초성만으로 된 검색어인지 (ㅅㄴㅇ)"""
+    return bool(term) and all(char in _CHOSEONG_SET for char in term)
+
+
+class LinkView:
+    """링크 하나의 검색/정렬용 필드 (fold 적용)
+
+    initials 는 제목의 초성 문자열 - 초성 검색어 (ㅅㄴㅇ) 는 여기서도 찾는다.
+    category 는 분류 번호 그대로 (cat: 검색어용).
+    title_key/url_key 는 정렬용 대조 키 - 정렬할 때 처음 만들어 둔다 (collation).
+    대조 키도 보기를 만들 때의 제목/주소 (raw_title/raw_url) 로 계산하므로, 레코드가 나중에
+    제자리에서 고쳐져도 한 보기의 값은 서로 맞는다.
+    """
+
+    __slots__ = ('title', 'description', 'url', 'initials', 'category', 'raw_title', 'raw_url',
+                 'title_key', 'url_key')
+
+    def __init__(self, link: Dict[str, Any]):
+        self.raw_title = link.get('title', '')
+        self.raw_url = link.get('url', '')
+        self.title = fold(self.raw_title)
+        self.description = fold(link.get('description', ''))
+        self.url = fold(self.raw_url)
+        self.initials = initials(self.title)
+        self.category = link.get('category', '0')
+        self.title_key: Optional[CollationKey] = None
+        self.url_key: Optional[CollationKey] = None
+
+    def collation(self, field: str) -> CollationKey:
+        """정렬 키 (field 는 'title' 또는 'url') - 처음 부를 때 만들어 둠"""
+        if field == 'title':
+            if self.title_key is None:
+                self.title_key = collation_key(self.raw_title)
+            return self.title_key
+        if self.url_key is None:
+            self.url_key = collation_key(self.raw_url)
+        return self.url_key
+
+
+class ViewCache:
+    """링크 id → LinkView 캐시
+
+    처음 필요할 때 만들고, 레코드가 바뀔 때 (추가/수정) refresh() 로만 다시 만든다.
+    UI 스레드 전용 - 검색 작업 스레드는 copy() 한 스냅샷 전용 캐시를 쓴다.
+    """
+
+    def __init__(self):
+        self._views: Dict[int, LinkView] = {}
+
+    def __call__(self, link: Dict[str, Any]) -> LinkView:
+        view = self._views.get(link['id'])
+        if view is None:
+            view = self._views[link['id']] = LinkView(link)
+        return view
+
+    def refresh(self, link: Dict[str, Any]) -> None:
+        self._views[link['id']] = LinkView(link)
+
+    def discard(self, link_id: int) -> None:
+        self._views.pop(link_id, None)
+
+    def clear(self) -> None:
+        self._views.clear()
+
+    def copy(self) -> 'ViewCache':
+        """같은 LinkView 를 공유하는 복사본
+
+        LinkView 의 필드는 만든 뒤 바뀌지 않는다. 대조 키만 처음 쓸 때 채우는데, 보기를
+        만들 때의 제목/주소로만 계산하므로 어느 복사본 (어느 스레드) 에서 채워도 같은 값이다.
+        """
+        views = ViewCache()
+        views._views = dict(self._views)
+        return views
+
+    def __len__(self) -> int:
+        return len(self._views)
+
+# ============================================================
+# 필드 지정 검색어 (title:, desc:, url:, cat:)
+# ============================================================
+CATEGORIES = {
+    '0': '분류안함',
+    '1': '교육',
+    '2': '아이디어',
+    '3': '생활',
+    '4': '농업',
+    '5': '쇼핑',
+    '6': '여행',
+    '7': '비즈니스',
+    '8': '건강',
+    '9': '가정',
+    '10': '커뮤니티'
+}
+
+# 필드 이름 → LinkView 속성 (cat: 은 분류 번호로 따로 처리)
+FIELD_ATTRS = {'title': 'title', 'desc': 'description', 'url': 'url'}
+FIELD_RE = re.compile(r'(title|desc|url|cat):(.+)', re.S)
+
+
+def split_field(term: str) -> Tuple[Optional[str], str]:
+    """검색어의 필드 지정 분리 ('title:고춧가루' → ('title', '고춧가루'), 없으면 (None, 검색어))"""
+    match = FIELD_RE.fullmatch(term)
+    if match is None:
+        return None, term
+    return match.group(1), match.group(2)
+
+
+@lru_cache(maxsize=64)
+def category_ids(value: str) -> Tuple[str, ...]:
+    """cat: 값에 맞는 분류 번호 (번호 그대로, 아니면 이름에 값이 들어 있는 분류)"""
+    if value in CATEGORIES:
+        return (value,)
+    return tuple(cat_id for cat_id, name in CATEGORIES.items() if value in fold(name)) or (value,)
+
+
+# ============================================================
+# 오타 허용 검색 (~검색어)
+# ============================================================
+WORD_RE = re.compile(r'\w+')
+
+
+def is_fuzzy(term: str) -> bool:
+    """오타 허용 검색어인지 (~산네음)"""
+    return len(term) > 1 and term[0] == '~'
+
+
+def fuzzy_limit(term: str) -> int:
+    """검색어 길이별로 허용하는 편집 거리 (두 글자 이하는 오타를 허용하지 않음)"""
+    length = len(term)
+    if length <= 2:
+        return 0
+    if length <= 5:
+        return 1
+    if length <= 9:
+        return 2
+    return 3
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """편집 거리 (limit 을 넘으면 더 계산하지 않고 limit + 1)"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        current = [i]
+        for j, other in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char != other)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return min(previous[-1], limit + 1)
+
+
+def fuzzy_words(text: str) -> Set[str]:
+    """오타 허용 검색 대상 단어 (fold 된 제목/URL 의 단어, 숫자만 있는 단어 제외)"""
+    return {word for word in WORD_RE.findall(text) if not word.isdigit()}
+
+
+def fuzzy_match(term: str, view: LinkView) -> bool:
+    """~term 판정 - term 이 들어 있거나, 제목/URL 에 편집 거리 안의 단어가 있으면 참"""
+    if term in view.title or term in view.description or term in view.url:
+        return True
+    limit = fuzzy_limit(term)
+    return bool(limit) and any(
+        edit_distance(term, word, limit) <= limit for word in fuzzy_words(f'{view.title} {view.url}')
+    )
+
+# ============================================================
+# 검색 파서 (OR, AND, NOT 연산 지원)
+# ============================================================
+class SearchParser:
+    """검색어 파서 - OR, AND, NOT 연산 지원"""
+    
+    PRECEDENCE = {'NOT': 3, 'AND': 2, 'OR': 1}
+    
+    # 검색어 토큰: 공백, 괄호, 연산자(대소문자 무시, 단어 앞부분이어도 연산자로 인식),
+    # 따옴표 구절(닫는 따옴표가 없으면 끝까지, 앞에 필드 지정 가능), 그 밖의 단어
+    TOKEN_RE = re.compile(
+        r'\s+|([()])|([Oo][Rr]|[Aa][Nn][Dd]|[Nn][Oo][Tt])|((?i:title|desc|url|cat):)?"([^"]*)"?|([^\s()]+)'
+    )
+    
+    @classmethod
+    def tokenize(cls, query: str) -> List[str]:
+        """검색어를 토큰으로 분리 (정규식 한 번 훑기, 검색어 길이에 비례)"""
+        if not query or not query.strip():
+            return []
+        
+        tokens = []
+        for paren, operator, field, phrase, word in cls.TOKEN_RE.findall(query):
+            if paren:
+                tokens.append(paren)
+            elif operator:
+                tokens.append(operator.upper())
+            else:
+                token = (phrase or word).strip()
+                if token:
+                    tokens.append(field + token)
+        return tokens
+    
+    @classmethod
+    def infix_to_postfix(cls, tokens: List[str]) -> List[str]:
+        """중위 표기법을 후위 표기법으로 변환"""
+        output = []
+        stack = []
+        
+        for token in tokens:
+            if token in ('OR', 'AND', 'NOT'):
+                while (stack and stack[-1] != '(' and 
+                       cls.PRECEDENCE.get(stack[-1], 0) >= cls.PRECEDENCE.get(token, 0)):
+                    output.append(stack.pop())
+                stack.append(token)
+            elif token == '(':
+                stack.append(token)
+            elif token == ')':
+                while stack and stack[-1] != '(':
+                    output.append(stack.pop())
+                if stack and stack[-1] == '(':
+                    stack.pop()
+            else:
+                output.append(fold(token))
+        
+        while stack:
+            output.append(stack.pop())
+        
+        return output
+    
+    @classmethod
+    def create_search_function(cls, postfix_tokens: Sequence[str]) -> Callable[[LinkView], bool]:
+        """후위 표기법 토큰을 검색 함수로 변환 (검색 함수는 LinkView 를 받음)"""
+        if not postfix_tokens:
+            return lambda view: True
+        
+        stack = []
+        
+        for token in postfix_tokens:
+            if token == 'OR':
+                if len(stack) < 2:
+                    continue
+                right = stack.pop()
+                left = stack.pop()
+                stack.append(lambda view, l=left, r=right: l(view) or r(view))
+            elif token == 'AND':
+                if len(stack) < 2:
+                    continue
+                right = stack.pop()
+                left = stack.pop()
+                stack.append(lambda view, l=left, r=right: l(view) and r(view))
+            elif token == 'NOT':
+                if len(stack) < 1:
+                    continue
+                operand = stack.pop()
+                stack.append(lambda view, op=operand: not op(view))
+            elif is_fuzzy(token):
+                stack.append(lambda view, term=token[1:]: fuzzy_match(term, view))
+            else:
+                stack.append(cls.term_function(token))
+        
+        return stack[0] if stack else lambda view: False
+    
+    @staticmethod
+    def term_function(token: str) -> Callable[[LinkView], bool]:
+        """검색어 하나의 판정 함수 (필드 지정, 초성 검색어 포함)"""
+        field, term = split_field(token)
+        if field == 'cat':
+            return lambda view, ids=category_ids(term): view.category in ids
+        if field is not None:
+            attr = FIELD_ATTRS[field]
+            if field == 'title' and is_choseong(term):
+                return lambda view: term in view.title or term in view.initials
+            return lambda view: term in getattr(view, attr)
+        if is_choseong(term):
+            return lambda view: (
+                term in view.title or
+                term in view.description or
+                term in view.url or
+                term in view.initials
+            )
+        return lambda view: (
+            term in view.title or
+            term in view.description or
+            term in view.url
+        )
+    
+    @classmethod
+    def compile_search_function(cls, postfix_tokens: Sequence[str]) -> Callable[[LinkView], bool]:
+        """후위 표기법 토큰을 파이썬 함수 하나로 컴파일
+
+        create_search_function 과 결과는 같지만 식 전체가 하나의 표현식이 되어
+        노드마다 함수를 부르지 않는다.
+        """
+        if not postfix_tokens:
+            return lambda view: True
+        
+        stack = []
+        for token in postfix_tokens:
+            if token in ('OR', 'AND'):
+                if len(stack) < 2:
+                    continue
+                right = stack.pop()
+                left = stack.pop()
+                stack.append(f'({left} {token.lower()} {right})')
+            elif token == 'NOT':
+                if len(stack) < 1:
+                    continue
+                stack.append(f'(not {stack.pop()})')
+            elif is_fuzzy(token):
+                stack.append(f'fuzzy_match({token[1:]!r}, view)')
+            else:
+                stack.append(cls.term_source(token))
+        
+        if not stack:
+            return lambda view: False
+        
+        source = (
+            'def match(view):\n'
+            '    t = view.title\n'
+            '    d = view.description\n'
+            '    u = view.url\n'
+            f'    return {stack[0]}\n'
+        )
+        namespace: Dict[str, Any] = {'fuzzy_match': fuzzy_match}
+        try:
+            exec(compile(source, '<검색식>', 'exec'), namespace)
+        except (SyntaxError, RecursionError, MemoryError):
+            # 괄호가 아주 깊은 식은 컴파일러 한도를 넘을 수 있음
+            return cls.create_search_function(postfix_tokens)
+        return namespace['match']
+    
+    @staticmethod
+    def term_source(token: str) -> str:
+        """검색어 하나의 판정 식 (compile_search_function 용, t/d/u 는 view 의 필드)"""
+        field, term = split_field(token)
+        if field == 'cat':
+            return f'(view.category in {category_ids(term)!r})'
+        choseong = is_choseong(term)
+        term = repr(term)
+        if field == 'title':
+            return f'({term} in t or {term} in view.initials)' if choseong else f'({term} in t)'
+        if field == 'desc':
+            return f'({term} in d)'
+        if field == 'url':
+            return f'({term} in u)'
+        if choseong:
+            return f'({term} in t or {term} in d or {term} in u or {term} in view.initials)'
+        return f'({term} in t or {term} in d or {term} in u)'
+    
+    @classmethod
+    def postfix(cls, query: str) -> Tuple[str, ...]:
+        """검색어의 후위 표기 토큰 (정규화한 검색어별로 캐시)"""
+        return cls._postfix_cached(cls.normalize(query))
+    
+    @classmethod
+    def parse(cls, query: str) -> Callable[[LinkView], bool]:
+        """검색어를 파싱하여 검색 함수 반환
+
+        검색어 → 후위 표기, 후위 표기 → 컴파일된 함수를 각각 캐시하므로
+        같은 검색어나 띄어쓰기/대소문자만 다른 연산자 표기는 다시 파싱하지 않는다.
+        """
+        return cls.compile(cls.postfix(query))
+    
+    @classmethod
+    def compile(cls, postfix_tokens: Sequence[str]) -> Callable[[LinkView], bool]:
+        """후위 표기 토큰 → 검색 함수 (캐시)"""
+        return cls._compile_cached(tuple(postfix_tokens))
+    
+    @classmethod
+    def conjoin(cls, postfix_tokens: Sequence[str], term: str) -> Tuple[str, ...]:
+        """검색식 결과에 AND term 을 덧붙인 후위 표기 (빈 식이면 term 만)
+
+        피연산자가 남는 식 (a b) 은 stack[0] 만 결과가 되므로 토큰 뒤에 그냥 붙이지 않고
+        식 트리에서 다시 만든다.
+        """
+        root = cls.tree(postfix_tokens)
+        if root is None:
+            return tuple(postfix_tokens) if postfix_tokens else (term,)
+        tokens: List[str] = []
+        
+        def emit(node):
+            if node[0] == 'TERM':
+                tokens.append(node[1])
+            else:
+                for child in node[1:]:
+                    emit(child)
+                tokens.append(node[0])
+        
+        emit(root)
+        tokens += [term, 'AND']
+        return tuple(tokens)
+    
+    @staticmethod
+    def normalize(query: str) -> str:
+        return query.strip() if query else ''
+    
+    @classmethod
+    def tree(cls, postfix_tokens: Sequence[str]) -> Optional[tuple]:
+        """후위 표기 → 식 트리 (create_search_function 과 같은 스택 규칙, 빈 식은 None)
+
+        노드: ('TERM', 검색어) / ('NOT', x) / ('AND', a, b) / ('OR', a, b)
+        """
+        stack = []
+        for token in postfix_tokens:
+            if token in ('OR', 'AND'):
+                if len(stack) < 2:
+                    continue
+                right = stack.pop()
+                stack.append((token, stack.pop(), right))
+            elif token == 'NOT':
+                if len(stack) < 1:
+                    continue
+                stack.append(('NOT', stack.pop()))
+            else:
+                stack.append(('TERM', token))
+        return stack[0] if stack else None
+    
+    @classmethod
+    def terms(cls, postfix_tokens: Sequence[str]) -> List[str]:
+        """NOT 아래에 있지 않은 검색어 (관련도 점수에 쓰는 검색어, 중복 없이 나온 순서대로)"""
+        terms: List[str] = []
+
+        def walk(node):
+            if node[0] == 'TERM':
+                if node[1] not in terms:
+                    terms.append(node[1])
+            elif node[0] != 'NOT':
+                walk(node[1])
+                walk(node[2])
+
+        root = cls.tree(postfix_tokens)
+        if root is not None:
+            walk(root)
+        return terms
+    
+    @classmethod
+    def narrows(cls, old_postfix: Sequence[str], new_postfix: Sequence[str]) -> bool:
+        """새 검색식의 결과가 항상 이전 결과의 부분집합인지 (확실할 때만 True)
+
+        검색어를 늘려 쓰거나 (바 → 바람) AND 조건을 덧붙인 경우 등.
+        """
+        old = cls.tree(old_postfix)
+        new = cls.tree(new_postfix)
+        if old is None or new is None:
+            return False
+        return cls._implies(new, old)
+    
+    @classmethod
+    def _implies(cls, new: tuple, old: tuple) -> bool:
+        """new 에 맞는 링크는 모두 old 에도 맞는가"""
+        if new == old:
+            return True
+        if new[0] == 'TERM' and old[0] == 'TERM':
+            if is_fuzzy(new[1]):
+                return False
+            if is_fuzzy(old[1]):
+                # ~검색어 는 검색어를 포함하는 링크를 모두 포함
+                return split_field(new[1])[0] != 'cat' and old[1][1:] in split_field(new[1])[1]
+            new_field, new_term = split_field(new[1])
+            old_field, old_term = split_field(old[1])
+            if new_field == 'cat' or old_field == 'cat':
+                return new_field == old_field and set(category_ids(new_term)) <= set(category_ids(old_term))
+            if old_field is not None and new_field != old_field:
+                return False
+            # 더 긴 검색어를 포함하면 그 안의 짧은 검색어도 포함 (필드 지정은 전체 필드의 부분집합)
+            return old_term in new_term
+        if new[0] == 'AND' and (cls._implies(new[1], old) or cls._implies(new[2], old)):
+            return True
+        if old[0] == 'OR' and (cls._implies(new, old[1]) or cls._implies(new, old[2])):
+            return True
+        if new[0] == old[0] and new[0] in ('AND', 'OR'):
+            return cls._implies(new[1], old[1]) and cls._implies(new[2], old[2])
+        if new[0] == old[0] == 'NOT':
+            return cls._implies(old[1], new[1])
+        return False
+    
+    @classmethod
+    @lru_cache(maxsize=256)
+    def _postfix_cached(cls, query: str) -> Tuple[str, ...]:
+        return tuple(cls.infix_to_postfix(cls.tokenize(query)))
+    
+    @classmethod
+    @lru_cache(maxsize=128)
+    def _compile_cached(cls, postfix: Tuple[str, ...]) -> Callable[[LinkView], bool]:
+        return cls.compile_search_function(postfix)
+
+# ============================================================
+# 글자 bigram 역색인
+# ============================================================
+class BigramIndex:
+    """검색어 후보를 좁히는 역색인 - 글자 하나/두 글자 조각 → 링크 id 목록
+
+    형태소 분석 없이도 한글 부분 문자열 검색에 쓸 수 있도록 title/description/url 에
+    fold() 를 적용한 뒤 한 글자(unigram)와 연속 두 글자(bigram)를 모두 색인한다.
+    필드는 '\0' 으로 이어 붙이므로 필드 경계를 넘는 조각에는 항상 '\0' 이 들어간다.
+    검색어가 어떤 필드의 부분 문자열이면 그 검색어의 bigram 은 모두 그 필드에 있으므로,
+    bigram 목록의 교집합은 항상 정답을 포함하는 후보가 된다. 최종 판정은 후보에 대해서만
+    기존 부분 문자열 검사로 한다.
+
+    초성 검색용으로 제목의 초성 문자열 (initials()) 도 같은 방식으로 따로 색인한다
+    (initial_postings). 오타 허용 검색용 단어 색인 (FuzzyIndex) 과 관련도 점수용 필드 길이
+    통계 (FieldStats) 도 함께 관리한다.
+
+    필드 지정 검색어 (title:, url:) 용으로 제목과 주소는 필드별로도 색인한다
+    (field_postings). desc: 는 전체 필드 색인으로 후보를 좁힌다 (설명이 가장 길어 따로
+    두면 색인이 두 배 가까이 됨). cat: 은 분류별 비트맵 (CategoryIndex, 앱이 따로 관리)
+    으로 답한다.
+
+    목록은 id 순으로 정렬된 array('I'). 삭제/수정 때 옛 조각은 지우지 않고 남겨 두며
+    (후보 검증에서 걸러짐), 남은 조각이 많아지면 needs_rebuild() 가 참이 된다.
+    live 는 현재 있는 링크 id 의 비트맵 (BitsetEvaluator 의 NOT 계산용).
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, array] = {}
+        self.initial_postings: Dict[str, array] = {}
+        self.field_postings: Dict[str, Dict[str, array]] = {'title': {}, 'url': {}}
+        self.fuzzy = FuzzyIndex()
+        self.stats = FieldStats()
+        self.live = 0
+        self.size = 0
+        self.stale = 0
+
+    @classmethod
+    def build(cls, links: Iterable[Dict[str, Any]]) -> 'BigramIndex':
+        """링크 목록 전체로 색인 생성 (링크 수에 비례해 오래 걸리므로 백그라운드 스레드용)"""
+        start = time.perf_counter()
+        postings: Dict[str, array] = {}
+        initial_postings: Dict[str, array] = {}
+        title_postings: Dict[str, array] = {}
+        url_postings: Dict[str, array] = {}
+        grams = cls.grams
+        initial_grams = cls.initial_grams
+        field_grams = cls.field_grams
+        fuzzy = FuzzyIndex()
+        stats = FieldStats()
+        links = sorted(links, key=itemgetter('id'))
+        for link in links:
+            link_id = link['id']
+            fuzzy.add(link_id, cls.words(link))
+            stats.add(link)
+            for target, link_grams in ((postings, grams(link)), (initial_postings, initial_grams(link)),
+                                       (title_postings, field_grams(link, 'title')),
+                                       (url_postings, field_grams(link, 'url'))):
+                for gram in link_grams:
+                    ids = target.get(gram)
+                    if ids is None:
+                        target[gram] = ids = array('I')
+                    ids.append(link_id)
+
+        index = cls()
+        index.postings = postings
+        index.initial_postings = initial_postings
+        index.field_postings = {'title': title_postings, 'url': url_postings}
+        index.fuzzy = fuzzy
+        index.stats = stats
+        index.live = bitmap_from_ids(link['id'] for link in links)
+        index.size = size = len(links)
+        Logger.info(f'검색 색인: 링크 {size:,}개, 조각 {len(postings):,}개 ({(time.perf_counter() - start) * 1000:.0f}ms)')
+        return index
+
+    @staticmethod
+    def grams(link: Dict[str, Any]) -> Set[str]:
+        """링크의 색인 조각"""
+        text = fold('\0'.join((link.get('title', ''), link.get('description', ''), link.get('url', ''))))
+        grams = set(text)
+        grams.update(map(add, text, text[1:]))
+        return grams
+
+    @staticmethod
+    def field_grams(link: Dict[str, Any], field: str) -> Set[str]:
+        """필드 하나의 색인 조각 (필드 지정 검색어용)"""
+        text = fold(link.get(field, ''))
+        grams = set(text)
+        grams.update(map(add, text, text[1:]))
+        return grams
+
+    @staticmethod
+    def initial_grams(link: Dict[str, Any]) -> Set[str]:
+        """제목 초성 문자열의 색인 조각"""
+        text = initials(fold(link.get('title', '')))
+        grams = set(text)
+        grams.update(map(add, text, text[1:]))
+        return grams
+
+    @staticmethod
+    def words(link: Dict[str, Any]) -> Set[str]:
+        """오타 허용 검색용 제목/URL 단어"""
+        return fuzzy_words(fold(f"{link.get('title', '')} {link.get('url', '')}"))
+
+    @staticmethod
+    def term_grams(term: str) -> Set[str]:
+        if len(term) == 1:
+            return {term}
+        return {term[i:i + 2] for i in range(len(term) - 1)}
+
+    # ---------------- 갱신 ----------------
+    def add(self, link: Dict[str, Any]) -> None:
+        link_id = link['id']
+        self._add_grams(self.postings, self.grams(link), link_id)
+        self._add_grams(self.initial_postings, self.initial_grams(link), link_id)
+        for field, postings in self.field_postings.items():
+            self._add_grams(postings, self.field_grams(link, field), link_id)
+        self.fuzzy.add(link_id, self.words(link))
+        self.stats.add(link)
+        self.live |= 1 << link_id
+        self.size += 1
+
+    @staticmethod
+    def _add_grams(postings: Dict[str, array], grams: Set[str], link_id: int) -> None:
+        for gram in grams:
+            ids = postings.get(gram)
+            if ids is None:
+                postings[gram] = array('I', (link_id,))
+            elif not ids or ids[-1] < link_id:
+                # 새 링크는 보통 가장 큰 id 라 뒤에 붙이기만 하면 됨
+                ids.append(link_id)
+            else:
+                k = bisect_left(ids, link_id)
+                if k == len(ids) or ids[k] != link_id:
+                    ids.insert(k, link_id)
+
+    def update(self, link: Dict[str, Any]) -> None:
+        """수정된 링크의 새 조각 추가 (옛 조각은 후보 검증에서 걸러짐)"""
+        self.stats.remove(link['id'])
+        self.add(link)
+        self.size -= 1
+        self.stale += 1
+
+    def remove(self, link_id: int) -> None:
+        self.stats.remove(link_id)
+        self.live &= ~(1 << link_id)
+        self.size -= 1
+        self.stale += 1
+
+    def needs_rebuild(self) -> bool:
+        return self.stale > max(self.size // 2, 1000)
+
+    # ---------------- 조회 ----------------
+    def candidates(self, term: str) -> Set[int]:
+        """검색어를 포함할 수 있는 링크 id (초성 검색어는 제목 초성 후보도 합침)
+
+        필드 지정 검색어는 그 필드의 색인에서 찾는다. cat: 은 CategoryIndex 가 답하므로
+        여기서 다루지 않는다.
+        """
+        field, term = split_field(term)
+        result = self._intersect(self.field_postings.get(field, self.postings), term)
+        if field in (None, 'title') and is_choseong(term):
+            result |= self._intersect(self.initial_postings, term)
+        return result
+
+    def _intersect(self, postings: Dict[str, array], term: str) -> Set[int]:
+        """검색어 조각 목록의 교집합 (짧은 목록부터)"""
+        lists = []
+        for gram in self.term_grams(term):
+            ids = postings.get(gram)
+            if ids is None:
+                return set()
+            lists.append(ids)
+        lists.sort(key=len)
+        result = set(lists[0])
+        for ids in lists[1:]:
+            if not result:
+                break
+            result.intersection_update(ids)
+        return result
+
+    def candidates_for(self, postfix: List[str]) -> Optional[Set[int]]:
+        """후위 표기 검색식 전체의 후보 id (None 이면 전체를 검사해야 함)
+
+        create_search_function 과 같은 스택 규칙으로 계산한다.
+        NOT, 오타 허용 검색어, cat: 은 bigram 으로 좁힐 수 없으므로 None (전체) 이 된다.
+        """
+        if not postfix:
+            return None
+
+        stack: List[Optional[Set[int]]] = []
+        for token in postfix:
+            if token in ('OR', 'AND'):
+                if len(stack) < 2:
+                    continue
+                right = stack.pop()
+                left = stack.pop()
+                if token == 'OR':
+                    stack.append(None if left is None or right is None else left | right)
+                elif left is None:
+                    stack.append(right)
+                elif right is None:
+                    stack.append(left)
+                else:
+                    stack.append(left & right)
+            elif token == 'NOT':
+                if len(stack) < 1:
+                    continue
+                stack.pop()
+                stack.append(None)
+            elif is_fuzzy(token) or split_field(token)[0] == 'cat':
+                stack.append(None)
+            else:
+                stack.append(self.candidates(token))
+
+        return stack[0] if stack else set()
+
+
+class FuzzyIndex:
+    """오타 허용 검색용 단어 색인 - 제목/URL 단어 → 링크 id, 단어의 글자 조각 → 단어 번호
+
+    조각은 앞뒤에 공백을 붙인 단어의 연속 두 글자 (' 산', '산내', '내음', '음 ').
+    한글 단어는 두세 음절이 많아 세 글자 조각으로는 오타 하나에도 겹치는 조각이
+    남지 않으므로 두 글자로 한다. 편집 한 번은 조각을 많아야 두 개 없애므로, 편집 거리
+    k 안의 단어는 검색어 조각 중 적어도 (조각 수 - 2k) 개를 가진다. 이만큼 겹치는
+    단어만 편집 거리를 계산하므로 전체 단어를 훑지 않는다.
+
+    BigramIndex 와 마찬가지로 단어는 지우지 않는다 (후보 검증에서 걸러짐).
+    """
+
+    # 검색어 하나에 받아들이는 단어 수 (가까운 단어부터)
+    MAX_WORDS = 200
+
+    def __init__(self):
+        self.words: List[str] = []
+        self.word_numbers: Dict[str, int] = {}
+        self.grams: Dict[str, array] = {}
+        self.postings: Dict[str, array] = {}
+
+    @staticmethod
+    def word_grams(word: str) -> Set[str]:
+        padded = f' {word} '
+        return set(map(add, padded, padded[1:]))
+
+    def add(self, link_id: int, words: Set[str]) -> None:
+        for word in words:
+            if word not in self.word_numbers:
+                number = self.word_numbers[word] = len(self.words)
+                self.words.append(word)
+                for gram in self.word_grams(word):
+                    numbers = self.grams.get(gram)
+                    if numbers is None:
+                        self.grams[gram] = array('I', (number,))
+                    else:
+                        numbers.append(number)
+        BigramIndex._add_grams(self.postings, words, link_id)
+
+    def lookup(self, term: str) -> List[Tuple[int, str]]:
+        """term 과 편집 거리 fuzzy_limit(term) 안의 단어 [(거리, 단어)] (가까운 순)"""
+        limit = fuzzy_limit(term)
+        if not limit:
+            return []
+        grams = self.word_grams(term)
+        shared: Counter = Counter()
+        for gram in grams:
+            numbers = self.grams.get(gram)
+            if numbers is not None:
+                shared.update(numbers)
+
+        need = max(1, len(grams) - 2 * limit)
+        shortest, longest = len(term) - limit, len(term) + limit
+        words = self.words
+        found = []
+        for number, count in shared.items():
+            if count >= need:
+                word = words[number]
+                if shortest <= len(word) <= longest:
+                    distance = edit_distance(term, word, limit)
+                    if distance <= limit:
+                        found.append((distance, -count, word))
+        found.sort()
+        return [(distance, word) for distance, _, word in found[:self.MAX_WORDS]]
+
+
+class CategoryIndex:
+    """분류 번호 → 링크 id 비트맵과 링크 수 (cat: 검색어, 분류 선택 창의 개수용)
+
+    링크마다 지금 분류를 id 위치에 남겨 두므로 분류를 바꾸거나 지울 때 옛 분류의
+    비트를 바로 끈다 - 다른 색인과 달리 항상 정확하다. 검색 색인과 달리 목록을 다 읽으면
+    바로 만들고 추가/수정/삭제마다 UI 스레드에서 갱신한다 (검색 작업 스레드는 읽기만 함).
+    """
+
+    def __init__(self):
+        self.members: Dict[str, int] = {}
+        self.counts: Dict[str, int] = {}
+        self._category_of: List[Optional[str]] = []
+
+    @classmethod
+    def build(cls, pairs: Iterable[Tuple[int, str]]) -> 'CategoryIndex':
+        """(링크 id, 분류) 목록으로 생성"""
+        index = cls()
+        groups: Dict[str, List[int]] = {}
+        category_of = index._category_of
+        for link_id, category in pairs:
+            groups.setdefault(category, []).append(link_id)
+            if link_id >= len(category_of):
+                category_of.extend([None] * max(link_id + 1 - len(category_of), len(category_of)))
+            category_of[link_id] = category
+        index.members = {category: bitmap_from_ids(ids) for category, ids in groups.items()}
+        index.counts = {category: len(ids) for category, ids in groups.items()}
+        return index
+
+    def count(self, category: Optional[str] = None) -> int:
+        """분류의 링크 수 (None 이면 전체)"""
+        if category is None:
+            return sum(self.counts.values())
+        return self.counts.get(category, 0)
+
+    def add(self, link: Dict[str, Any]) -> None:
+        """추가/수정된 링크의 분류 반영"""
+        link_id = link['id']
+        category = link.get('category', '0')
+        category_of = self._category_of
+        if link_id >= len(category_of):
+            category_of.extend([None] * max(link_id + 1 - len(category_of), len(category_of)))
+        elif category_of[link_id] == category:
+            return
+        self.remove(link_id)
+        category_of[link_id] = category
+        self.members[category] = self.members.get(category, 0) | (1 << link_id)
+        self.counts[category] = self.counts.get(category, 0) + 1
+
+    def remove(self, link_id: int) -> None:
+        category_of = self._category_of
+        if 0 <= link_id < len(category_of) and category_of[link_id] is not None:
+            category = category_of[link_id]
+            self.members[category] &= ~(1 << link_id)
+            self.counts[category] -= 1
+            category_of[link_id] = None
+
+    update = add
+
+    def bitmap(self, categories: Iterable[str]) -> int:
+        bitmap = 0
+        for category in categories:
+            bitmap |= self.members.get(category, 0)
+        return bitmap
+
+
+# ============================================================
+# 비트맵 집합 연산 평가
+# ============================================================
+# 바이트 값 → 켜진 비트 위치
+_BYTE_BITS = [tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256)]
+
+
+def bitmap_from_ids(ids: Iterable[int]) -> int:
+    """링크 id 목록 → 비트맵 (비트 위치 = id)"""
+    bits = bytearray()
+    for link_id in ids:
+        byte = link_id >> 3
+        if byte >= len(bits):
+            bits.extend(bytes(max(byte + 1 - len(bits), len(bits))))
+        bits[byte] |= 1 << (link_id & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def bitmap_ids(bitmap: int) -> Iterator[int]:
+    """비트맵의 켜진 비트 위치 (작은 id 부터)"""
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) >> 3, 'little')
+    for offset, byte in enumerate(data):
+        if byte:
+            base = offset << 3
+            for bit in _BYTE_BITS[byte]:
+                yield base + bit
+
+
+class BitsetEvaluator:
+    """후위 표기 검색식을 링크 id 비트맵의 집합 연산으로 평가
+
+    검색어마다 일치하는 링크 비트맵(파이썬 int)을 한 번씩만 구한 뒤
+    AND/OR/NOT 을 &, |, 여집합으로 계산한다. create_search_function 의
+    클로저가 링크마다 식 전체를 다시 도는 것과 달리 링크 수 × 식 깊이만큼의
+    함수 호출이 없다. 스택 규칙(피연산자가 모자라면 연산자 무시, 결과는 stack[0])은
+    create_search_function 과 같다.
+
+    index 가 있으면 검색어 후보를 색인으로 좁혀 검증하고, 없으면 전체를 검사한다.
+    ~검색어는 색인이 없어도 단어 색인 (FuzzyIndex) 을 한 번 만들어 쓴다 (fuzzy_index).
+    검증은 views (링크 → LinkView) 로 한다.
+
+    search() 는 결과가 하나도 없으면 일치하는 링크가 없는 검색어를 ~검색어 로 바꿔
+    한 번 더 찾는다 (NOT 이 있는 식은 제외). 이때 바꾼 식이 fuzzy_postfix 에 남는다.
+
+    cat: 검색어는 categories 가 있으면 그 비트맵으로 바로 답한다.
+    cancelled 가 있으면 검색어마다 확인해 참이면 SearchCancelled 를 던진다 (SearchJob 용).
+    """
+
+    def __init__(self, link_map: Mapping[int, Dict[str, Any]], views: Callable[[Dict[str, Any]], LinkView],
+                 index: Optional[BigramIndex] = None, categories: Optional[CategoryIndex] = None,
+                 cancelled: Optional[Callable[[], bool]] = None):
+        self.link_map = link_map
+        self.views = views
+        self.index = index
+        self.categories = categories
+        self.cancelled = cancelled
+        self.fuzzy_postfix: Optional[List[str]] = None
+        self._universe: Optional[int] = None
+        self._terms: Dict[str, int] = {}
+        self._fuzzy: Optional[FuzzyIndex] = None
+
+    def universe(self) -> int:
+        """현재 있는 모든 링크의 비트맵"""
+        if self._universe is None:
+            if self.index is not None:
+                self._universe = self.index.live
+            else:
+                self._universe = bitmap_from_ids(self.link_map)
+        return self._universe
+
+    def term_bitmap(self, term: str) -> int:
+        """title/description/url 중 하나에 term 이 들어 있는 링크의 비트맵"""
+        if self.cancelled is not None and self.cancelled():
+            raise SearchCancelled()
+        if is_fuzzy(term):
+            return self.fuzzy_bitmap(term[1:])
+        field, value = split_field(term)
+        if field == 'cat' and self.categories is not None:
+            return self.categories.bitmap(category_ids(value))
+        link_map = self.link_map
+        views = self.views
+        if self.index is not None and field != 'cat':
+            # 삭제된 링크의 id 는 후보에 남아 있을 수 있음
+            records = ((link_id, link_map.get(link_id)) for link_id in self.index.candidates(term))
+        else:
+            records = link_map.items()
+        matched = []
+        if field is not None:
+            match = SearchParser.term_function(term)
+            for link_id, link in records:
+                if link is not None and match(views(link)):
+                    matched.append(link_id)
+            return bitmap_from_ids(matched)
+        choseong = is_choseong(term)
+        for link_id, link in records:
+            if link is not None:
+                view = views(link)
+                if (term in view.title or term in view.description or term in view.url or
+                        choseong and term in view.initials):
+                    matched.append(link_id)
+        return bitmap_from_ids(matched)
+
+    def fuzzy_index(self) -> FuzzyIndex:
+        """오타 허용 검색용 단어 색인 - 검색 색인의 것, 없으면 (만드는 중) 이 검색에서 한 번 만듦
+
+        임시 색인도 단어 조각으로 후보 단어를 좁히므로 편집 거리는 가까운 단어에만 계산한다.
+        단어를 모으는 데 링크 수만큼 걸리지만 검색 한 번에 ~검색어가 여럿이어도 한 번뿐이다.
+        """
+        if self.index is not None:
+            return self.index.fuzzy
+        if self._fuzzy is None:
+            fuzzy = FuzzyIndex()
+            views = self.views
+            for count, (link_id, link) in enumerate(sorted(self.link_map.items(), key=itemgetter(0))):
+                if not count % 4096 and self.cancelled is not None and self.cancelled():
+                    raise SearchCancelled()
+                view = views(link)
+                fuzzy.add(link_id, fuzzy_words(f'{view.title} {view.url}'))
+            self._fuzzy = fuzzy
+        return self._fuzzy
+
+    def fuzzy_bitmap(self, term: str) -> int:
+        """~term 에 맞는 링크의 비트맵 (term 을 포함하거나 제목/URL 에 가까운 단어가 있는 링크)"""
+        link_map = self.link_map
+        views = self.views
+        bitmap = self.term_bitmap(term)
+        fuzzy = self.fuzzy_index()
+        for _, word in fuzzy.lookup(term):
+            matched = []
+            for link_id in fuzzy.postings[word]:
+                link = link_map.get(link_id)
+                if link is not None:
+                    # 수정/삭제된 링크의 옛 단어는 여기서 걸러짐
+                    view = views(link)
+                    if word in view.title or word in view.url:
+                        matched.append(link_id)
+            bitmap |= bitmap_from_ids(matched)
+        return bitmap
+
+    def evaluate(self, postfix: List[str]) -> int:
+        """후위 표기 검색식 → 일치하는 링크의 비트맵"""
+        if not postfix:
+            return self.universe()
+
+        terms = self._terms
+        stack: List[int] = []
+        for token in postfix:
+            if token == 'OR':
+                if len(stack) < 2:
+                    continue
+                right = stack.pop()
+                stack.append(stack.pop() | right)
+            elif token == 'AND':
+                if len(stack) < 2:
+                    continue
+                right = stack.pop()
+                stack.append(stack.pop() & right)
+            elif token == 'NOT':
+                if len(stack) < 1:
+                    continue
+                stack.append(self.universe() & ~stack.pop())
+            else:
+                if token not in terms:
+                    terms[token] = self.term_bitmap(token)
+                stack.append(terms[token])
+
+        return stack[0] if stack else 0
+
+    def document_frequency(self, term: str) -> int:
+        """term 에 맞는 링크 수 (검색 때 구한 비트맵을 다시 씀)"""
+        bitmap = self._terms.get(term)
+        if bitmap is None:
+            bitmap = self._terms[term] = self.term_bitmap(term)
+        return bin(bitmap).count('1')
+
+    def fuzzy_fallback(self, postfix: Sequence[str]) -> Optional[List[str]]:
+        """evaluate() 뒤 일치하는 링크가 없던 검색어를 ~검색어 로 바꾼 식 (바꿀 것이 없으면 None)"""
+        if 'NOT' in postfix:
+            return None
+        terms = self._terms
+        fuzzy = [
+            f'~{token}' if (token not in ('OR', 'AND') and not is_fuzzy(token) and not is_choseong(token) and
+                            split_field(token)[0] is None and fuzzy_limit(token) and not terms.get(token)) else token
+            for token in postfix
+        ]
+        return fuzzy if fuzzy != list(postfix) else None
+
+    def search(self, postfix: List[str]) -> List[Dict[str, Any]]:
+        """일치하는 링크 (id 순). 없으면 오타 허용 검색으로 한 번 더 찾음
+
+        색인이 link_map (스냅샷) 보다 새로우면 link_map 에 없는 id 가 나올 수 있으므로 건너뛴다.
+        """
+        link_map = self.link_map
+        bitmap = self.evaluate(postfix)
+        if not bitmap:
+            fuzzy = self.fuzzy_fallback(postfix)
+            if fuzzy is not None:
+                bitmap = self.evaluate(fuzzy)
+                self.fuzzy_postfix = fuzzy
+        links = (link_map.get(link_id) for link_id in bitmap_ids(bitmap))
+        return [link for link in links if link is not None]
+
+
+# ============================================================
+# 관련도 순위 (BM25)
+# ============================================================
+class FieldStats:
+    """관련도 점수용 필드 길이 통계 - 링크 수와 title/description/url 길이 합
+
+    링크별 길이를 id 위치의 array 에 남겨 두므로 수정/삭제 때 옛 레코드 없이도
+    합계에서 뺄 수 있다 (추가/수정/삭제마다 상수 시간).
+    """
+
+    FIELDS = ('title', 'description', 'url')
+
+    def __init__(self):
+        self.count = 0
+        self.totals = [0] * len(self.FIELDS)
+        self._lengths = [array('I') for _ in self.FIELDS]
+        self._present = bytearray()
+
+    @classmethod
+    def from_links(cls, links: Iterable[Dict[str, Any]]) -> 'FieldStats':
+        """한 번 쓰고 버리는 통계 (색인이 아직 없을 때, 링크별 길이는 남기지 않음)"""
+        stats = cls()
+        totals = stats.totals
+        for link in links:
+            stats.count += 1
+            for i, field in enumerate(cls.FIELDS):
+                totals[i] += len(link.get(field, ''))
+        return stats
+
+    def add(self, link: Dict[str, Any]) -> None:
+        link_id = link['id']
+        if link_id >= len(self._present):
+            grow = max(link_id + 1 - len(self._present), len(self._present))
+            self._present.extend(bytes(grow))
+            for lengths in self._lengths:
+                lengths.frombytes(bytes(grow * lengths.itemsize))
+        elif self._present[link_id]:
+            self.remove(link_id)
+        self._present[link_id] = 1
+        self.count += 1
+        for i, field in enumerate(self.FIELDS):
+            length = len(link.get(field, ''))
+            self._lengths[i][link_id] = length
+            self.totals[i] += length
+
+    def remove(self, link_id: int) -> None:
+        if link_id < 0 or link_id >= len(self._present) or not self._present[link_id]:
+            return
+        self._present[link_id] = 0
+        self.count -= 1
+        for i, lengths in enumerate(self._lengths):
+            self.totals[i] -= lengths[link_id]
+
+    def averages(self) -> List[float]:
+        count = max(self.count, 1)
+        return [max(total / count, 1.0) for total in self.totals]
+
+
+class RelevanceScorer:
+    """검색 결과의 관련도 점수 (필드 가중치를 둔 BM25, BM25F)
+
+    검색어마다 필드별 등장 횟수를 필드 길이로 정규화해 가중치 (제목 > 설명 > 주소) 를
+    곱해 더한 뒤 BM25 포화 함수와 idf 를 적용한다. 문서 빈도는 document_frequency
+    (보통 BitsetEvaluator.document_frequency), 평균 필드 길이는 FieldStats 에서 얻는다.
+    NOT 아래의 검색어는 점수에 넣지 않는다. ~검색어 는 ~ 를 뗀 검색어의 등장 횟수로 센다.
+    필드 지정 검색어는 그 필드에서만 세고, cat: 은 점수에 넣지 않는다.
+    """
+
+    WEIGHTS = (3.0, 1.0, 0.5)
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, postfix: Sequence[str], stats: FieldStats, document_frequency: Callable[[str], int]):
+        count = stats.count
+        self.averages = stats.averages()
+        # (검색어, 필드 이름 또는 None, idf)
+        self.terms: List[Tuple[str, Optional[str], float]] = []
+        for term in SearchParser.terms(postfix):
+            field, word = split_field(term)
+            if field == 'cat':
+                continue
+            frequency = min(document_frequency(term), count)
+            if is_fuzzy(word):
+                word = word[1:]
+            self.terms.append((word, field, math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))))
+
+    def score(self, view: LinkView) -> float:
+        k1, b = self.K1, self.B
+        fields = (view.title, view.description, view.url)
+        total = 0.0
+        for term, only, idf in self.terms:
+            frequency = 0.0
+            for name, field, weight, average in zip(FIELD_ATTRS, fields, self.WEIGHTS, self.averages):
+                if only is not None and only != name:
+                    continue
+                occurrences = field.count(term)
+                if occurrences:
+                    frequency += weight * occurrences / (1 - b + b * len(field) / average)
+            if only in (None, 'title') and is_choseong(term):
+                occurrences = view.initials.count(term)
+                if occurrences:
+                    frequency += self.WEIGHTS[0] * occurrences / (1 - b + b * len(view.title) / self.averages[0])
+            if frequency:
+                total += idf * frequency / (k1 + frequency)
+        return total
+
+    def key(self, views: Callable[[Dict[str, Any]], LinkView]) -> Callable[[Dict[str, Any]], float]:
+        """RankedResults 용 정렬 키 (점수가 높을수록 작음)"""
+        score = self.score
+        return lambda link: -score(views(link))
+
+
+# ============================================================
+# 정렬 순서 (정렬 기준별로 미리 정렬해 두고 추가/수정/삭제 때 bisect 로 갱신)
+# ============================================================
+# 정렬 방식 → (정렬 키 필드, 내림차순 여부) - 키는 LinkView.collation
+SORT_KEYS = {
+    'title_asc': ('title', False),
+    'title_desc': ('title', True),
+    'url_asc': ('url', False),
+    'url_desc': ('url', True),
+}
+
+
+class _Descending:
+    """힙 (최소 힙) 에서 큰 키부터 나오게 비교를 뒤집은 키"""
+
+    __slots__ = ('key',)
+
+    def __init__(self, key: Any):
+        self.key = key
+
+    def __lt__(self, other: '_Descending') -> bool:
+        return other.key < self.key
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.key == other.key
+
+
+class RankedResults:
+    """검색 결과를 앞에서부터 한 페이지 분량씩 순서대로 놓음 (부분 정렬)
+
+    키 (정렬 키나 점수) 는 검색마다 링크당 한 번만 구해 힙에 넣고, rank_through() 는
+    힙에서 모자란 만큼만 꺼낸다 (페이지마다 k log n). links 는 보여 줄 목록 그 자체로,
+    앞 ranked 개만 순서가 정해져 있고 뒤쪽 순서는 의미가 없다. 꺼낸 링크는 ranked 자리의
+    링크와 자리를 맞바꾸므로 목록을 다시 만들지 않는다. 키가 같으면 id 순.
+
+    목록이 바뀌면 (링크 수정) invalidate() - 다음 rank_through() 가 남은 뒤쪽의 키를 다시 구한다.
+    """
+
+    def __init__(self, links: List[Dict[str, Any]], key: Callable[[Dict[str, Any]], Any],
+                 reverse: bool = False):
+        self.links = links
+        self.key = key
+        self.reverse = reverse
+        self.ranked = 0
+        # (키, id) 최소 힙과 뒤쪽 링크 id → 목록에서의 자리
+        self._heap: Optional[List[Tuple[Any, int]]] = None
+        self._positions: Dict[int, int] = {}
+
+    def _build(self) -> None:
+        key = self.key
+        tail = self.links[self.ranked:]
+        if self.reverse:
+            heap = [(_Descending(key(link)), link['id']) for link in tail]
+        else:
+            heap = [(key(link), link['id']) for link in tail]
+        heapq.heapify(heap)
+        self._heap = heap
+        self._positions = {link['id']: i for i, link in enumerate(tail, self.ranked)}
+
+    def rank_through(self, end: int) -> None:
+        """앞 end 개까지 순서를 정함 (이미 정했으면 그대로)"""
+        links = self.links
+        end = min(end, len(links))
+        if end <= self.ranked:
+            return
+        if self._heap is None:
+            self._build()
+        heap = self._heap
+        positions = self._positions
+        pop = heapq.heappop
+        while self.ranked < end and heap:
+            link_id = pop(heap)[1]
+            i = positions.pop(link_id, None)
+            if i is None:
+                # 그 사이 목록에서 빠진 링크
+                continue
+            target = self.ranked
+            if i != target:
+                moved = links[target]
+                links[target], links[i] = links[i], moved
+                positions[moved['id']] = i
+            self.ranked += 1
+
+    def attach(self, links: List[Dict[str, Any]], key: Callable[[Dict[str, Any]], Any]) -> 'RankedResults':
+        """같은 순서의 다른 목록 (UI 스레드에서 지금 레코드로 바꾼 목록) 과 키 함수로 옮김
+
+        힙의 키는 그대로 쓰고 key 는 invalidate() 뒤에 다시 구할 때만 쓴다.
+        그 사이 지워진 링크가 빠져 자리가 달라졌으면 뒤쪽 자리를 다시 센다.
+        """
+        if len(links) != len(self.links):
+            present = {link['id'] for link in links}
+            self.ranked = sum(1 for link in self.links[:self.ranked] if link['id'] in present)
+            self._positions = {links[i]['id']: i for i in range(self.ranked, len(links))}
+        self.links = links
+        self.key = key
+        return self
+
+    def remove(self, link: Dict[str, Any]) -> None:
+        """목록에서 링크를 뺌 - 뒤쪽이면 마지막 링크를 그 자리로 옮김 (순서를 정한 앞부분은 유지)"""
+        links = self.links
+        i = self._positions.pop(link['id'], None) if self._heap is not None else None
+        if i is None:
+            try:
+                i = links.index(link)
+            except ValueError:
+                return
+        if i < self.ranked:
+            del links[i]
+            self.ranked -= 1
+            if self._heap is not None:
+                self._positions = {links[j]['id']: j for j in range(self.ranked, len(links))}
+            return
+        last = links.pop()
+        if last is not link:
+            links[i] = last
+            if self._heap is not None:
+                self._positions[last['id']] = i
+
+    def invalidate(self) -> None:
+        self._heap = None
+
+
+class SortedOrders:
+    """정렬 기준 (제목, 주소) 별로 (대조 키, id) 를 정렬해 둔 목록
+
+    오름차순과 내림차순은 같은 목록을 앞에서/뒤에서 읽는 것이라 정렬 방식을 바꿔도 다시
+    정렬하지 않는다. 추가/수정/삭제는 bisect 로 항목 하나만 넣고 뺀다. 키가 같으면 id 순.
+    build() 는 백그라운드 스레드에서 (id, 제목, 주소) 로 키를 만들고 (보기/레코드 없이),
+    그 뒤로는 UI 스레드 전용 (검색 작업 스레드는 자기 스냅샷으로 정렬함).
+    """
+
+    FIELDS = ('title', 'url')
+
+    def __init__(self, views: Callable[[Dict[str, Any]], LinkView]):
+        self.views = views
+        self.orders: Dict[str, List[Tuple[CollationKey, int]]] = {field: [] for field in self.FIELDS}
+        # id → 넣을 때의 키 (필드 순) - 수정/삭제할 때 옛 항목을 찾는 데 씀
+        self._keys: Dict[int, Tuple[CollationKey, ...]] = {}
+
+    @classmethod
+    def build(cls, rows: Iterable[Tuple[int, str, str]], views: Callable[[Dict[str, Any]], LinkView]) -> 'SortedOrders':
+        """rows 는 (id, 제목, 주소) - LinkView.collation 과 같은 키 (link_store.link_sort_fields)
+
+        views 는 build 에서 쓰지 않고, 이후 추가/수정 (UI 스레드) 때 키를 만드는 데 쓴다.
+        """
+        orders = cls(views)
+        keys = orders._keys
+        for link_id, title, url in rows:
+            keys[link_id] = (collation_key(title), collation_key(url))
+        for i, field in enumerate(cls.FIELDS):
+            order = [(key[i], link_id) for link_id, key in keys.items()]
+            order.sort()
+            orders.orders[field] = order
+        return orders
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, link: Dict[str, Any]) -> None:
+        """추가/수정된 링크를 각 정렬 목록의 제자리에 넣음"""
+        link_id = link['id']
+        view = self.views(link)
+        key = tuple(view.collation(field) for field in self.FIELDS)
+        if self._keys.get(link_id) == key:
+            return
+        self.remove(link_id)
+        self._keys[link_id] = key
+        for field, value in zip(self.FIELDS, key):
+            insort(self.orders[field], (value, link_id))
+
+    update = add
+
+    def remove(self, link_id: int) -> None:
+        key = self._keys.pop(link_id, None)
+        if key is None:
+            return
+        for field, value in zip(self.FIELDS, key):
+            order = self.orders[field]
+            i = bisect_left(order, (value, link_id))
+            if i < len(order) and order[i][1] == link_id:
+                del order[i]
+
+    def links(self, sort: str, link_map: Mapping[int, Dict[str, Any]]) -> 'SortedLinks':
+        """전체 링크를 정렬 방식 순으로 보는 목록 (복사 없이 정렬 목록을 그대로 읽음)"""
+        field, reverse = SORT_KEYS[sort]
+        return SortedLinks(self.orders[field], link_map, reverse)
+
+    def key(self, sort: str) -> Tuple[Callable[[Dict[str, Any]], Tuple[CollationKey, int]], bool]:
+        """링크 일부 (검색 결과) 를 정렬할 (키 함수, 내림차순 여부) - 넣을 때 저장해 둔 키를 씀"""
+        field, reverse = SORT_KEYS[sort]
+        i = self.FIELDS.index(field)
+        keys = self._keys
+        return (lambda link: (keys[link['id']][i], link['id'])), reverse
+
+
+class SortedLinks:
+    """SortedOrders 의 정렬 목록 하나를 링크 목록처럼 읽음 (내림차순은 뒤에서부터)
+
+    정렬 목록을 복사하지 않으므로 추가/수정/삭제가 바로 보인다.
+    """
+
+    __slots__ = ('order', 'link_map', 'reverse')
+
+    def __init__(self, order: List[Tuple[CollationKey, int]], link_map: Mapping[int, Dict[str, Any]], reverse: bool):
+        self.order = order
+        self.link_map = link_map
+        self.reverse = reverse
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self.order)))]
+        n = len(self.order)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError(i)
+        if self.reverse:
+            i = n - 1 - i
+        return self.link_map[self.order[i][1]]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        order = reversed(self.order) if self.reverse else self.order
+        link_map = self.link_map
+        for _, link_id in order:
+            yield link_map[link_id]
+
+
+# ============================================================
+# 백그라운드 검색 (작업 스레드에서 스냅샷으로 검색, 새 검색이 오면 취소)
+# ============================================================
+class SearchCancelled(Exception):
+    """더 새 검색이 와서 작업을 그만둠"""
+
+
+class SearchSnapshot:
+    """검색 작업 스레드에 넘기는 목록 스냅샷
+
+    links 는 frozen_links() 로 고정한 목록, views 는 이 스냅샷 전용 ViewCache
+    (작업 스레드만 채움). link_map 은 처음 필요할 때 작업 스레드에서 만든다.
+    version 은 만들 때의 데이터 버전 - 목록이 바뀌면 UI 쪽에서 새로 만든다.
+    """
+
+    def __init__(self, links: Sequence[Dict[str, Any]], views: ViewCache,
+                 build_map: Callable[[Sequence[Dict[str, Any]]], Mapping[int, Dict[str, Any]]], version: int):
+        self.links = links
+        self.views = views
+        self.version = version
+        self._build_map = build_map
+        self._link_map: Optional[Mapping[int, Dict[str, Any]]] = None
+
+    @property
+    def link_map(self) -> Mapping[int, Dict[str, Any]]:
+        if self._link_map is None:
+            self._link_map = self._build_map(self.links)
+        return self._link_map
+
+
+class SearchJob:
+    """검색 한 번 - 거르기, 정렬 (첫 페이지 분량 k 개만 순서를 정함) 까지 작업 스레드에서 실행
+
+    결과는 링크 id 목록 (ids) 으로 남긴다. UI 스레드는 이를 지금의 레코드로 바꿔 쓰므로
+    그 사이 지워진 링크는 빠진다. pool 이 있으면 (이전 결과를 좁히는 검색) 그 목록만
+    다시 검사하고, reorder 면 pool 이 이미 검색 결과라 거르지 않고 정렬만 다시 한다.
+    query 가 있으면 (SQLite 저장소의 query_ids) 색인 대신 그 질의 결과로 거른다. 다만
+    SQL 은 편집 거리를 모르므로 ~검색어가 있거나 결과가 없으면 (오타 허용 검색) 메모리에서 찾는다.
+    정렬 키 (점수) 를 힙에 넣어 둔 ranking 도 남기므로 UI 스레드는 다음 페이지를
+    힙에서 꺼내기만 한다. cancel() 은 검색어/단계마다 확인하는 깃발만 세운다.
+    """
+
+    SORT_KEYS = SORT_KEYS
+    # 이전 결과를 다시 검사할 때 취소를 확인하는 간격 (링크 수)
+    CHUNK = 4096
+
+    def __init__(self, postfix: Sequence[str], snapshot: SearchSnapshot, index: Optional[BigramIndex],
+                 categories: Optional[CategoryIndex], sort: str, k: int, pool: Optional[List[Dict[str, Any]]] = None,
+                 reorder: bool = False, fuzzy_postfix: Optional[List[str]] = None,
+                 query: Optional[Callable[[List[str]], List[int]]] = None):
+        self.postfix = tuple(postfix)
+        self.snapshot = snapshot
+        self.index = index
+        self.categories = categories
+        self.sort = sort
+        self.k = k
+        self.pool = pool
+        self.reorder = reorder
+        self.query = query
+        self.cancelled = False
+        self.ids: List[int] = []
+        self.fuzzy_postfix = fuzzy_postfix
+        self.scorer: Optional[RelevanceScorer] = None
+        self.ranking: Optional[RankedResults] = None
+        # 전체에서 거를 때 쓴 평가기 - 관련도 정렬의 문서 빈도가 검색어 비트맵을 다시 씀
+        self._evaluator: Optional[BitsetEvaluator] = None
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+    def check(self) -> None:
+        if self.cancelled:
+            raise SearchCancelled()
+
+    def run(self) -> bool:
+        """검색 실행 (취소되면 False)"""
+        try:
+            links = self.filter()
+            self.check()
+            links = self.order(links)
+            self.check()
+        except SearchCancelled:
+            return False
+        self.ids = [link['id'] for link in links]
+        return True
+
+    def evaluator(self, link_map: Optional[Mapping[int, Dict[str, Any]]] = None) -> BitsetEvaluator:
+        if link_map is None:
+            link_map = self.snapshot.link_map
+        return BitsetEvaluator(link_map, self.snapshot.views, self.index, self.categories,
+                               lambda: self.cancelled)
+
+    def filter(self) -> List[Dict[str, Any]]:
+        if self.reorder:
+            return list(self.pool)
+        if self.query is not None and not any(is_fuzzy(token) for token in self.postfix):
+            link_map = self.snapshot.link_map
+            links = [link_map[link_id] for link_id in self.query(list(self.postfix)) if link_id in link_map]
+            if links:
+                return links
+            self.check()
+        if self.pool is None:
+            evaluator = self._evaluator = self.evaluator()
+            links = evaluator.search(list(self.postfix))
+            self.fuzzy_postfix = evaluator.fuzzy_postfix
+            return links
+        pool = self.pool
+        links = []
+        if any(is_fuzzy(token) for token in self.postfix):
+            # ~검색어는 링크마다 단어 편집 거리를 재지 않도록 단어 색인으로 평가 (후보는 남은 목록 안에서만)
+            bitmap = self.evaluator({link['id']: link for link in pool}).evaluate(list(self.postfix))
+            for start in range(0, len(pool), self.CHUNK):
+                self.check()
+                links.extend(link for link in pool[start:start + self.CHUNK] if bitmap >> link['id'] & 1)
+        else:
+            match = SearchParser.compile(self.postfix)
+            views = self.snapshot.views
+            for start in range(0, len(pool), self.CHUNK):
+                self.check()
+                links.extend(link for link in pool[start:start + self.CHUNK] if match(views(link)))
+        if not links:
+            # 좁혀서 없으면 오타 허용 검색까지 하도록 전체에서 다시
+            self.pool = None
+            return self.filter()
+        return links
+
+    def order(self, links: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        views = self.snapshot.views
+        if self.sort == 'relevance':
+            index = self.index
+            stats = index.stats if index is not None else FieldStats.from_links(self.snapshot.links)
+            # 좁힌 목록/질의 결과/정렬만 다시 할 때는 문서 빈도를 전체 목록에서 새로 구함
+            evaluator = self._evaluator if self._evaluator is not None else self.evaluator()
+            self.scorer = RelevanceScorer(self.fuzzy_postfix or self.postfix, stats, evaluator.document_frequency)
+            self.ranking = RankedResults(links, self.scorer.key(views))
+        else:
+            key = self.SORT_KEYS.get(self.sort)
+            if key is None:
+                return links
+            attr, reverse = key
+            # 키가 같으면 id 순 (UI 스레드의 SortedOrders 와 같은 순서)
+            self.ranking = RankedResults(links, lambda link: (views(link).collation(attr), link['id']), reverse)
+        self.ranking.rank_through(self.k)
+        return links
@@ -0,0 +1,1208 @@
+# -*- coding: utf-8 -*-
+"""산내음 링크 저장소 - links.json 스냅샷 + 추가 전용 저널"""
+import os
+import sys
+import json
+import mmap
+import struct
+import time
+import codecs
+import sqlite3
+import threading
+import logging
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left
+from collections.abc import MutableSequence, MutableMapping
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Callable, Iterator, Sequence, Tuple
+
+from link_search import fold, initials, is_choseong, is_fuzzy, split_field, category_ids
+
+# kivy.logger.Logger 와 같은 'kivy' 로거 (Kivy 없이도 임포트 가능하도록)
+Logger = logging.getLogger('kivy')
+
+# ============================================================
+# 링크 id
+# ============================================================
+def assign_ids(links: List[Dict[str, Any]]) -> None:
+    """id 가 없는 예전 레코드에 순서대로 id 부여 (같은 파일이면 항상 같은 결과)"""
+    missing = 0
+    for link in links:
+        if 'id' not in link:
+            missing += 1
+            link['id'] = missing
+    if missing:
+        fix_duplicate_ids(links)
+
+
+def fix_duplicate_ids(links: List[Dict[str, Any]]) -> None:
+    """중복된 id 는 뒤쪽 레코드에 새 id 를 줌"""
+    seen = set()
+    next_id = max(link['id'] for link in links) + 1
+    for link in links:
+        if link['id'] in seen:
+            link['id'] = next_id
+            next_id += 1
+        seen.add(link['id'])
+
+
+def find_by_content(links: List[Dict[str, Any]], link: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """내용이 같은 첫 레코드 (id 도입 전 저널 항목 재생용)"""
+    for record in links:
+        if all(record.get(key) == value for key, value in link.items()):
+            return record
+    return None
+
+
+def frozen_links(links: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """다른 스레드에 넘길 목록 복사본 (얕은 복사, 지연 목록은 디코딩 없이 고정)"""
+    if isinstance(links, LazyLinkList):
+        return links.frozen_copy()
+    return list(links)
+
+
+def link_categories(links: List[Dict[str, Any]]) -> Iterator[Tuple[int, str]]:
+    """(id, 분류) 목록 (지연 목록은 디코딩하지 않고 스냅샷 열에서 읽음)"""
+    if isinstance(links, LazyLinkList):
+        return links.id_categories()
+    return ((link['id'], link.get('category', '0')) for link in links)
+
+
+def link_sort_fields(links: List[Dict[str, Any]]) -> Iterator[Tuple[int, str, str]]:
+    """(id, 제목, 주소) 목록 - 정렬 목록용 (지연 목록은 디코딩하지 않고 스냅샷 문자열에서 읽음)"""
+    if isinstance(links, LazyLinkList):
+        return links.id_fields(('title', 'url'))
+    return ((link['id'], link.get('title', ''), link.get('url', '')) for link in links)
+
+
+def build_id_map(links: List[Dict[str, Any]]) -> MutableMapping:
+    """id → 레코드 맵 (지연 목록은 필요할 때 디코딩하는 맵)"""
+    if isinstance(links, LazyLinkList):
+        return LazyIdMap.for_list(links)
+    return {link['id']: link for link in links}
+
+# ============================================================
+# 저장소 공통 (UI 스레드 쪽 인터페이스)
+# ============================================================
+class LinkStore(ABC):
+    """변경 요청을 받아 PersistenceWorker 로 넘기는 저장소 기본 클래스
+
+    하위 클래스는 load() 와 write_batch() (저장 스레드에서 호출) 를 구현한다.
+    """
+
+    COMPACT_THRESHOLD = 200
+    supports_query = False
+
+    def __init__(self, save_delay: float = 0.5):
+        self.journal_entries = 0
+        self.next_id = 1
+        self.worker = PersistenceWorker(self, save_delay)
+        self.worker.start()
+
+    def new_id(self) -> int:
+        """새 링크에 줄 고유 id"""
+        link_id = self.next_id
+        self.next_id += 1
+        return link_id
+
+    @abstractmethod
+    def load(self) -> List[Dict[str, Any]]:
+        """모든 링크를 읽어 목록으로 반환"""
+
+    def load_async(self, first_batch: int, on_batch: Callable, on_done: Callable, on_error: Callable) -> None:
+        """링크를 읽어 콜백으로 전달 (기본: 한 번에 읽기)
+
+        on_batch(records, loaded, estimated_total), on_done(links), on_error(exc).
+        하위 클래스는 백그라운드 스레드에서 콜백을 호출할 수 있으므로
+        UI 쪽에서 Clock 으로 메인 스레드에 넘겨야 한다.
+        """
+        try:
+            links = self.load()
+        except Exception as e:
+            on_error(e)
+            return
+        on_batch(links, len(links), len(links))
+        on_done(links)
+
+    @abstractmethod
+    def write_batch(self, batch: List[Any]) -> None:
+        """모아진 요청 (('entry', 항목) 또는 ('snapshot', 목록)) 을 기록 (저장 스레드)"""
+
+    def log_add(self, link: Dict[str, Any]) -> None:
+        self._submit({'op': 'add', 'link': dict(link)})
+
+    def log_update(self, link: Dict[str, Any]) -> None:
+        self._submit({'op': 'update', 'link': dict(link)})
+
+    def log_delete(self, link_id: int) -> None:
+        self._submit({'op': 'delete', 'id': link_id})
+
+    def _submit(self, entry: Dict[str, Any]) -> None:
+        self.worker.submit(('entry', entry))
+        self.journal_entries += 1
+
+    def should_compact(self) -> bool:
+        return self.journal_entries >= self.COMPACT_THRESHOLD
+
+    def compact_async(self, links: List[Dict[str, Any]]) -> None:
+        """현재 목록으로 스냅샷 기록 예약
+
+        목록은 얕은 복사로 넘긴다. 이후 UI 스레드가 레코드를 제자리에서 고쳐
+        스냅샷에 더 새로운 값이 들어가더라도, 같은 수정이 저널에 뒤따라 기록되고
+        id 기준으로 다시 적용되므로 결과는 같다.
+        """
+        self.worker.submit(('snapshot', frozen_links(links)))
+        self.journal_entries = 0
+
+    def compact(self, links: List[Dict[str, Any]]) -> None:
+        """현재 목록으로 즉시 스냅샷을 기록하고 끝날 때까지 대기 (앱 종료 시)"""
+        self.compact_async(links)
+        self.worker.flush()
+
+    def flush(self) -> None:
+        self.worker.flush()
+
+    def close(self) -> None:
+        self.worker.stop()
+
+# ============================================================
+# 저널 저장소
+# ============================================================
+class JournalStore(LinkStore):
+    """변경 사항은 저널에 한 줄씩 추가하고, 주기적으로 스냅샷으로 압축하는 저장소
+
+    파일 구성 (links.json 기준):
+      links.json            - 마지막으로 압축된 스냅샷 (기존과 같은 JSON 배열)
+      links.journal         - 스냅샷 이후의 변경 기록 (한 줄에 JSON 하나)
+      links.journal.pending - 압축 중인 봉인된 저널
+      links.json.compact    - 압축 중인 새 스냅샷
+
+    압축 순서: 저널 봉인 → 새 스냅샷 기록/fsync → 봉인 저널 삭제 → 스냅샷 교체.
+    어느 단계에서 종료되어도 load() 가 남은 파일을 보고 복구한다.
+    파일 기록은 모두 PersistenceWorker 스레드에서 일어나고, UI 스레드는 요청만 넣는다.
+    """
+
+    def __init__(self, snapshot_path: Path, save_delay: float = 0.5):
+        self.snapshot_path = Path(snapshot_path)
+        name = self.snapshot_path.stem
+        self.journal_path = self.snapshot_path.with_name(f'{name}.journal')
+        self.pending_path = self.snapshot_path.with_name(f'{name}.journal.pending')
+        self.compact_path = self.snapshot_path.with_name(f'{self.snapshot_path.name}.compact')
+        self.binary_path = self.snapshot_path.with_name(f'{name}.bin')
+        self._journal_file = None
+        super().__init__(save_delay)
+
+    # ---------------- 읽기 ----------------
+    STREAM_BATCH = 2000
+
+    def load(self) -> List[Dict[str, Any]]:
+        """스냅샷을 읽고 봉인된 저널과 현재 저널을 순서대로 재생"""
+        self._recover()
+
+        links = self._open_binary()
+        if links is None:
+            links = []
+            if self.snapshot_path.exists():
+                with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                    links = json.load(f)
+            assign_ids(links)
+
+        self._replay(links, self._read_journals())
+        return links
+
+    def load_async(self, first_batch: int, on_batch: Callable, on_done: Callable, on_error: Callable) -> None:
+        """스냅샷을 백그라운드 스레드에서 조금씩 읽어 전달
+
+        첫 first_batch 개는 읽자마자 넘겨 첫 화면을 바로 그릴 수 있게 하고,
+        나머지는 STREAM_BATCH 개씩 넘긴다. 저널은 작으므로 먼저 읽어 두었다가
+        스냅샷을 다 읽은 뒤 적용해 on_done 으로 최종 목록을 넘긴다.
+        """
+        try:
+            self._recover()
+            entries = self._read_journals()
+            links = self._open_binary()
+        except Exception as e:
+            on_error(e)
+            return
+
+        if links is not None:
+            # 바이너리 스냅샷은 매핑만 하면 되므로 바로 완료
+            self._replay(links, entries)
+            on_done(links)
+            return
+
+        def stream():
+            try:
+                links = []
+                batch = []
+                limit = first_batch
+                missing_id = 0
+                if self.snapshot_path.exists():
+                    total_bytes = self.snapshot_path.stat().st_size
+                    reader = JsonArrayReader(self.snapshot_path)
+                    for link in reader:
+                        if 'id' not in link:
+                            # id 가 없던 예전 데이터 - assign_ids 와 같은 규칙으로 순서대로 부여
+                            missing_id += 1
+                            link['id'] = missing_id
+                        links.append(link)
+                        batch.append(link)
+                        if len(batch) >= limit:
+                            estimated = round(len(links) * total_bytes / max(reader.consumed_bytes(), 1))
+                            on_batch(batch, len(links), max(estimated, len(links)))
+                            batch = []
+                            limit = self.STREAM_BATCH
+                if batch:
+                    on_batch(batch, len(links), len(links))
+
+                if missing_id:
+                    fix_duplicate_ids(links)
+                self._replay(links, entries)
+                on_done(links)
+            except Exception as e:
+                on_error(e)
+
+        threading.Thread(target=stream, name='StreamingLoader', daemon=True).start()
+
+    def _open_binary(self) -> Optional['LazyLinkList']:
+        """links.json 과 같은 시점의 links.bin 이 있으면 지연 목록으로 열기"""
+        if not self.binary_path.exists():
+            return None
+        try:
+            snapshot = BinarySnapshot(self.binary_path)
+        except Exception as e:
+            Logger.warning(f'바이너리 스냅샷 무시: {e}')
+            return None
+        if not snapshot.matches(self.snapshot_path):
+            snapshot.close()
+            return None
+        return LazyLinkList(snapshot)
+
+    def _read_journals(self) -> List[Dict[str, Any]]:
+        """봉인된 저널과 현재 저널의 항목을 순서대로 읽음"""
+        entries = []
+        for path in (self.pending_path, self.journal_path):
+            if path.exists():
+                entries.extend(self.read_journal(path))
+        self.journal_entries = len(entries)
+        return entries
+
+    @staticmethod
+    def read_journal(path: Path) -> List[Dict[str, Any]]:
+        """저널 파일의 변경 기록 목록"""
+        entries = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # 기록 도중 종료되어 잘린 마지막 줄
+                    Logger.warning(f'저널: 손상된 항목 무시 ({path.name})')
+        return entries
+
+    def _replay(self, links: List[Dict[str, Any]], entries: List[Dict[str, Any]]) -> None:
+        """저널 항목을 적용하고 다음 id 계산"""
+        by_id = build_id_map(links)
+        for entry in entries:
+            self.apply(links, entry, by_id)
+        if isinstance(by_id, LazyIdMap):
+            self.next_id = by_id.max_id() + 1
+        else:
+            self.next_id = max(by_id, default=0) + 1
+
+    @staticmethod
+    def apply(links: List[Dict[str, Any]], entry: Dict[str, Any], by_id: MutableMapping) -> None:
+        """저널 항목 하나를 적용 (id 로 대상 식별, 수정은 레코드를 제자리에서 갱신)"""
+        op = entry.get('op')
+        if op == 'add':
+            link = entry['link']
+            if 'id' not in link:
+                # id 도입 전 저널
+                link['id'] = (by_id.max_id() if isinstance(by_id, LazyIdMap) else max(by_id, default=0)) + 1
+            links.append(link)
+            by_id[link['id']] = link
+        elif op == 'update':
+            link = entry['link']
+            if 'id' in link:
+                record = by_id.get(link['id'])
+            else:
+                record = find_by_content(links, entry.get('old', {}))
+                link = dict(link, id=record['id']) if record is not None else link
+            if record is not None:
+                record.update(link)
+        elif op == 'delete':
+            if 'id' in entry:
+                record = by_id.pop(entry['id'], None)
+            else:
+                record = find_by_content(links, entry.get('link', {}))
+                if record is not None:
+                    del by_id[record['id']]
+            if record is not None:
+                links.remove(record)
+
+    def _recover(self) -> None:
+        """중단된 압축 정리"""
+        if not self.compact_path.exists():
+            return
+
+        if self.pending_path.exists():
+            # 새 스냅샷이 끝까지 기록되었는지 확인 후 압축 마무리
+            try:
+                with open(self.compact_path, 'r', encoding='utf-8') as f:
+                    json.load(f)
+            except ValueError:
+                self.compact_path.unlink()
+                return
+            self.pending_path.unlink()
+        os.replace(self.compact_path, self.snapshot_path)
+
+    def close(self) -> None:
+        super().close()
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
+
+    # ---------------- 쓰기 (저장 스레드) ----------------
+    def write_batch(self, batch: List[Any]) -> None:
+        """모아진 요청을 한 번에 기록
+
+        마지막 스냅샷 요청 이전의 저널 항목은 그 스냅샷에 이미 포함되므로 버린다.
+        """
+        last_snapshot = None
+        for i, (kind, _) in enumerate(batch):
+            if kind == 'snapshot':
+                last_snapshot = i
+
+        entries = batch
+        if last_snapshot is not None:
+            try:
+                self._write_compacted(list(batch[last_snapshot][1]))
+                entries = batch[last_snapshot + 1:]
+            except Exception as e:
+                # 압축 실패 시 이번 항목은 모두 저널로 남긴다
+                Logger.error(f'저널 압축 실패: {e}')
+        entries = [item for item in entries if item[0] == 'entry']
+
+        if entries:
+            if self._journal_file is None:
+                self._journal_file = open(self.journal_path, 'a', encoding='utf-8')
+            self._journal_file.write(''.join(
+                json.dumps(entry, ensure_ascii=False) + '\n' for _, entry in entries
+            ))
+            self._journal_file.flush()
+            os.fsync(self._journal_file.fileno())
+
+    def _seal(self) -> None:
+        """현재 저널을 봉인 (이전 압축이 실패해 남은 봉인 저널이 있으면 이어 붙임)"""
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
+        if not self.journal_path.exists():
+            return
+        if self.pending_path.exists():
+            with open(self.journal_path, 'r', encoding='utf-8') as src, \
+                    open(self.pending_path, 'a', encoding='utf-8') as dst:
+                dst.write(src.read())
+                dst.flush()
+                os.fsync(dst.fileno())
+            self.journal_path.unlink()
+        else:
+            os.replace(self.journal_path, self.pending_path)
+
+    def _write_compacted(self, snapshot: List[Dict[str, Any]]) -> None:
+        self._seal()
+        write_json_durable(self.compact_path, snapshot)
+        if self.pending_path.exists():
+            self.pending_path.unlink()
+        os.replace(self.compact_path, self.snapshot_path)
+        fsync_dir(self.snapshot_path.parent)
+
+        try:
+            BinarySnapshot.write(self.binary_path, snapshot, self.snapshot_path)
+        except Exception as e:
+            # 바이너리 스냅샷은 시작 속도용 부가 파일 - 실패해도 links.json 은 완전함
+            Logger.warning(f'바이너리 스냅샷 기록 실패: {e}')
+
+
+# ============================================================
+# 바이너리 스냅샷 (메모리 매핑, 지연 디코딩)
+# ============================================================
+class BinarySnapshot:
+    """links.bin 읽기 - 파일을 메모리 매핑하고 레코드는 요청될 때만 디코딩
+
+    구성 (리틀 엔디언):
+      헤더 96바이트    - 매직, 버전, 레코드 수, 분류 사전 길이, 원본 links.json 의 크기/mtime,
+                         각 영역의 오프셋
+      레코드 테이블    - 레코드당 24바이트 (title, description, url 각각의 힙 오프셋/길이, uint32)
+      id 열            - 레코드당 uint32
+      id 정렬 색인     - 정렬된 id (uint32) 와 그 레코드 번호 (uint32), id 조회용 이진 탐색
+      분류 열          - 레코드당 uint16 (분류 사전 인덱스)
+      분류 사전        - 분류 문자열 목록 (JSON)
+      문자열 힙        - UTF-8 문자열
+    """
+
+    MAGIC = b'SNLB'
+    VERSION = 2
+    HEADER = struct.Struct('<4sHHIIQQQQQQQ')
+    HEADER_SIZE = 96
+    FIELDS = ('title', 'description', 'url')
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 빈 파일은 매핑할 수 없음
+            self._file.close()
+            raise ValueError(f'{self.path.name}: 빈 파일')
+
+        (magic, version, _, self.count, cat_dict_len, self.source_size, self.source_mtime_ns,
+         table_off, ids_off, sorted_off, cat_off, self._heap_off) = self.HEADER.unpack_from(self._mm, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            self._mm.close()
+            self._file.close()
+            raise ValueError(f'{self.path.name}: 지원하지 않는 형식')
+
+        n = self.count
+        view = memoryview(self._mm)
+        self._views = [
+            view[table_off:table_off + n * 24].cast('I'),
+            view[ids_off:ids_off + n * 4].cast('I'),
+            view[sorted_off:sorted_off + n * 4].cast('I'),
+            view[sorted_off + n * 4:sorted_off + n * 8].cast('I'),
+            view[cat_off:cat_off + n * 2].cast('H'),
+            view,
+        ]
+        self._table, self.ids, self._sorted_ids, self._sorted_numbers, self._cats = self._views[:5]
+        cat_dict_off = cat_off + n * 2
+        self.categories = json.loads(self._mm[cat_dict_off:cat_dict_off + cat_dict_len].decode('utf-8'))
+        self.max_id = self._sorted_ids[-1] if n else 0
+
+    def matches(self, source_path: Path) -> bool:
+        """원본 links.json 과 같은 시점의 스냅샷인지 확인"""
+        try:
+            st = os.stat(source_path)
+        except OSError:
+            return False
+        return st.st_size == self.source_size and st.st_mtime_ns == self.source_mtime_ns
+
+    def __len__(self) -> int:
+        return self.count
+
+    def number_of(self, link_id: int) -> Optional[int]:
+        """id 의 레코드 번호 (정렬 색인 이진 탐색)"""
+        k = bisect_left(self._sorted_ids, link_id)
+        if k < self.count and self._sorted_ids[k] == link_id:
+            return self._sorted_numbers[k]
+        return None
+
+    def text(self, i: int, name: str) -> str:
+        """레코드 i 의 문자열 필드 하나 (dict 를 만들지 않고 힙에서 바로 읽음)"""
+        j = i * 6 + self.FIELDS.index(name) * 2
+        offset = self._heap_off + self._table[j]
+        return str(self._mm[offset:offset + self._table[j + 1]], 'utf-8')
+
+    def record(self, i: int) -> Dict[str, Any]:
+        table = self._table
+        mm = self._mm
+        heap = self._heap_off
+        j = i * 6
+        link = {'id': self.ids[i]}
+        for n, name in enumerate(self.FIELDS):
+            offset = heap + table[j + n * 2]
+            link[name] = str(mm[offset:offset + table[j + n * 2 + 1]], 'utf-8')
+        link['category'] = self.categories[self._cats[i]]
+        return link
+
+    def close(self) -> None:
+        for view in self._views:
+            view.release()
+        self._mm.close()
+        self._file.close()
+
+    @classmethod
+    def write(cls, path: Path, links: List[Dict[str, Any]], source_path: Path) -> None:
+        """links 를 바이너리 스냅샷으로 기록 (임시 파일 후 이름 변경)"""
+        table = array('I')
+        ids = array('I')
+        cat_column = array('H')
+        categories: Dict[str, int] = {}
+        heap = bytearray()
+
+        for link in links:
+            for name in cls.FIELDS:
+                data = link.get(name, '').encode('utf-8')
+                table.append(len(heap))
+                table.append(len(data))
+                heap += data
+            ids.append(link['id'])
+            category = link.get('category', '0')
+            cat_column.append(categories.setdefault(category, len(categories)))
+
+        if len(heap) >= 1 << 32 or len(categories) >= 1 << 16:
+            raise ValueError('바이너리 스냅샷 크기 한도 초과')
+
+        numbers = sorted(range(len(ids)), key=ids.__getitem__)
+        sorted_ids = array('I', [ids[r] for r in numbers])
+        sorted_numbers = array('I', numbers)
+        columns = [table, ids, sorted_ids, sorted_numbers, cat_column]
+        if sys.byteorder != 'little':
+            for column in columns:
+                column.byteswap()
+
+        cat_dict = json.dumps(list(categories), ensure_ascii=False).encode('utf-8')
+        table_off = cls.HEADER_SIZE
+        ids_off = table_off + len(table) * 4
+        sorted_off = ids_off + len(ids) * 4
+        cat_off = sorted_off + len(ids) * 8
+        heap_off = cat_off + len(cat_column) * 2 + len(cat_dict)
+        st = os.stat(source_path)
+        header = cls.HEADER.pack(cls.MAGIC, cls.VERSION, 0, len(links), len(cat_dict),
+                                 st.st_size, st.st_mtime_ns,
+                                 table_off, ids_off, sorted_off, cat_off, heap_off)
+
+        tmp_path = path.with_name(f'{path.name}.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(header.ljust(cls.HEADER_SIZE, b'\0'))
+            for column in columns:
+                f.write(column.tobytes())
+            f.write(cat_dict)
+            f.write(heap)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+
+class LazyLinkList(MutableSequence):
+    """BinarySnapshot 위의 링크 목록 - 레코드는 처음 접근할 때 dict 로 디코딩해 보관
+
+    _records 는 레코드 번호 → dict (아직 디코딩 전이면 None). 스냅샷 레코드가
+    0..n-1 이고 이후 추가된 레코드는 뒤에 붙는다. _order 는 목록 순서대로의
+    레코드 번호라서 삽입/삭제/정렬은 _order 만 바꾼다.
+    """
+
+    def __init__(self, snapshot: BinarySnapshot, records: Optional[List[Any]] = None,
+                 order: Optional[array] = None):
+        self.snapshot = snapshot
+        self._records = records if records is not None else [None] * len(snapshot)
+        self._order = order if order is not None else array('I', range(len(snapshot)))
+
+    def record(self, r: int) -> Dict[str, Any]:
+        """레코드 번호 r 의 dict (처음이면 디코딩)"""
+        item = self._records[r]
+        if item is None:
+            item = self.snapshot.record(r)
+            self._records[r] = item
+        return item
+
+    def _add_record(self, value: Dict[str, Any]) -> int:
+        self._records.append(value)
+        return len(self._records) - 1
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.record(r) for r in self._order[i]]
+        return self.record(self._order[i])
+
+    def __setitem__(self, i, value) -> None:
+        if isinstance(i, slice):
+            self._order[i] = array('I', [self._add_record(v) for v in value])
+        else:
+            self._order[i] = self._add_record(value)
+
+    def __delitem__(self, i) -> None:
+        del self._order[i]
+
+    def insert(self, i: int, value: Dict[str, Any]) -> None:
+        self._order.insert(i, self._add_record(value))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for r in self._order:
+            yield self.record(r)
+
+    def index(self, value, start: int = 0, stop: Optional[int] = None) -> int:
+        # 이미 디코딩된 레코드는 C 수준 탐색으로 찾고, 없으면 디코딩하며 찾음
+        stop = len(self._order) if stop is None else stop
+        r = -1
+        while True:
+            try:
+                r = self._records.index(value, r + 1)
+            except ValueError:
+                break
+            try:
+                return self._order.index(r, start, stop)
+            except ValueError:
+                continue
+        for i in range(start, stop):
+            r = self._order[i]
+            if self._records[r] is None and self.record(r) == value:
+                return i
+        raise ValueError('링크가 목록에 없습니다')
+
+    def __contains__(self, value) -> bool:
+        try:
+            self.index(value)
+            return True
+        except ValueError:
+            return False
+
+    def sort(self, key=None, reverse: bool = False) -> None:
+        if key is None:
+            raise TypeError('LazyLinkList.sort 에는 key 가 필요합니다')
+        self._order = array('I', sorted(self._order, key=lambda r: key(self.record(r)), reverse=reverse))
+
+    def copy(self) -> 'LazyLinkList':
+        """얕은 복사 - 디코딩하지 않고 같은 스냅샷 위의 지연 목록 (frozen_copy 와 같음)"""
+        return self.frozen_copy()
+
+    def id_categories(self) -> Iterator[Tuple[int, str]]:
+        """목록 순서대로 (id, 분류) - 아직 디코딩하지 않은 레코드는 id/분류 열에서 바로 읽음"""
+        records = self._records
+        ids = self.snapshot.ids
+        cats = self.snapshot._cats
+        names = self.snapshot.categories
+        for r in self._order:
+            link = records[r]
+            if link is None:
+                yield ids[r], names[cats[r]]
+            else:
+                yield link['id'], link.get('category', '0')
+
+    def id_fields(self, names: Sequence[str]) -> Iterator[Tuple[Any, ...]]:
+        """목록 순서대로 (id, 필드...) - 아직 디코딩하지 않은 레코드는 그 필드만 문자열 힙에서 읽음"""
+        records = self._records
+        snapshot = self.snapshot
+        ids = snapshot.ids
+        for r in self._order:
+            link = records[r]
+            if link is None:
+                yield (ids[r],) + tuple(snapshot.text(r, name) for name in names)
+            else:
+                yield (link['id'],) + tuple(link.get(name, '') for name in names)
+
+    def frozen_copy(self) -> 'LazyLinkList':
+        """디코딩하지 않고 현재 상태를 고정한 복사본 (저장 스레드 전달용)"""
+        return LazyLinkList(self.snapshot, list(self._records), array('I', self._order))
+
+
+class LazyIdMap(MutableMapping):
+    """LazyLinkList 의 id → 레코드 맵
+
+    스냅샷 레코드는 정렬 색인 이진 탐색으로 찾아 그때 디코딩하고,
+    이후 추가/삭제만 따로 기록한다.
+    """
+
+    def __init__(self, links: LazyLinkList):
+        self._links = links
+        self._added: Dict[int, Dict[str, Any]] = {}
+        self._deleted = set()
+
+    @classmethod
+    def for_list(cls, links: LazyLinkList) -> 'LazyIdMap':
+        """목록의 지금 상태에 맞는 맵 - 스냅샷 뒤에 추가된 레코드와 목록에서 빠진 스냅샷 레코드 반영"""
+        id_map = cls(links)
+        base = len(links.snapshot)
+        appended = [r for r in links._order if r >= base]
+        for r in appended:
+            link = links.record(r)
+            id_map._added[link['id']] = link
+        if len(links._order) - len(appended) < base:
+            present = set(links._order)
+            ids = links.snapshot.ids
+            id_map._deleted.update(ids[r] for r in range(base) if r not in present)
+        return id_map
+
+    def __getitem__(self, link_id: int) -> Dict[str, Any]:
+        if link_id in self._added:
+            return self._added[link_id]
+        if link_id not in self._deleted:
+            r = self._links.snapshot.number_of(link_id)
+            if r is not None:
+                return self._links.record(r)
+        raise KeyError(link_id)
+
+    def __setitem__(self, link_id: int, link: Dict[str, Any]) -> None:
+        self._added[link_id] = link
+
+    def __delitem__(self, link_id: int) -> None:
+        if link_id in self._added:
+            del self._added[link_id]
+        elif link_id in self._deleted or self._links.snapshot.number_of(link_id) is None:
+            raise KeyError(link_id)
+        self._deleted.add(link_id)
+
+    def __iter__(self) -> Iterator[int]:
+        for link_id in self._links.snapshot.ids:
+            if link_id not in self._deleted and link_id not in self._added:
+                yield link_id
+        yield from self._added
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def max_id(self) -> int:
+        return max(self._links.snapshot.max_id, max(self._added, default=0))
+
+
+class JsonArrayReader:
+    """JSON 배열 파일을 조금씩 읽으며 원소를 하나씩 돌려주는 반복자"""
+
+    def __init__(self, path: Path, chunk_size: int = 1 << 16):
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        self.bytes_read = 0
+        self._buf = ''
+        self._pos = 0
+
+    def consumed_bytes(self) -> int:
+        """지금까지 해석한 원소가 차지한 바이트 수 (읽어 두고 아직 해석하지 않은 부분 제외)"""
+        return self.bytes_read - len(self._buf[self._pos:].encode('utf-8'))
+
+    def __iter__(self) -> Iterator[Any]:
+        decoder = json.JSONDecoder()
+        utf8 = codecs.getincrementaldecoder('utf-8-sig')()
+        eof = False
+        started = False
+
+        with open(self.path, 'rb') as f:
+            while True:
+                buf = self._buf
+                pos = self._pos
+                while pos < len(buf) and buf[pos] in ' \t\r\n,':
+                    pos += 1
+                self._pos = pos
+
+                if pos < len(buf):
+                    if not started:
+                        if buf[pos] != '[':
+                            raise ValueError(f'{self.path.name}: JSON 배열이 아닙니다')
+                        started = True
+                        self._pos = pos + 1
+                        continue
+                    if buf[pos] == ']':
+                        return
+                    try:
+                        value, self._pos = decoder.raw_decode(buf, pos)
+                        yield value
+                        continue
+                    except json.JSONDecodeError:
+                        if eof:
+                            raise
+                elif eof:
+                    raise ValueError(f'{self.path.name}: JSON 배열이 끝나지 않았습니다')
+
+                # 원소가 청크 경계에 걸쳤거나 버퍼를 다 씀 - 더 읽기
+                chunk = f.read(self.chunk_size)
+                eof = not chunk
+                self.bytes_read += len(chunk)
+                self._buf = buf[pos:] + utf8.decode(chunk, final=eof)
+                self._pos = 0
+
+
+def write_json_durable(path: Path, data: Any) -> None:
+    """JSON 을 기록하고 디스크에 반영될 때까지 fsync"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def write_json_atomic(path: Path, data: Any) -> None:
+    """임시 파일에 기록 후 이름 변경으로 교체 (중간에 종료되어도 기존 파일 유지)"""
+    tmp_path = path.with_name(f'{path.name}.tmp')
+    write_json_durable(tmp_path, data)
+    os.replace(tmp_path, path)
+    fsync_dir(path.parent)
+
+
+def fsync_dir(path: Path) -> None:
+    """이름 변경이 디스크에 반영되도록 디렉터리 fsync (지원하지 않는 플랫폼은 무시)"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+# ============================================================
+# SQLite 저장소 (FTS5 전문 검색)
+# ============================================================
+class SqliteLinkStore(LinkStore):
+    """links.db 에 링크를 저장하고 검색/분류를 인덱스 질의로 처리하는 저장소
+
+    - title/description/url 은 FTS5 (trigram 토크나이저) 로 부분 문자열 검색
+    - category 는 일반 인덱스 (정렬은 앱이 메모리의 대조 키로 함)
+    - 처음 열 때 links.json (+ 저널) 을 한 번 옮겨 오고, 이후 links.json 은 내보내기 용도
+
+    쓰기는 저장 스레드의 연결로, 읽기는 읽기 연결로 한다 (WAL 모드). 검색 질의
+    (query_ids) 는 기록을 기다려야 하므로 검색 작업 스레드에서 부른다.
+    """
+
+    supports_query = True
+
+    def __init__(self, db_path: Path, json_path: Path, save_delay: float = 0.5):
+        self.db_path = Path(db_path)
+        self.json_path = Path(json_path)
+        self.fts_mode = None
+        self._reader: Optional[sqlite3.Connection] = None
+        self._writer: Optional[sqlite3.Connection] = None
+        # 검색 작업 스레드 여럿 (취소된 것 포함) 이 읽기 연결을 함께 씀
+        self._read_lock = threading.Lock()
+        super().__init__(save_delay)
+
+    def _connect(self) -> sqlite3.Connection:
+        # 읽기/쓰기 연결을 각각 한 스레드에서만 쓰지만 close() 는 UI 스레드에서 호출
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    @staticmethod
+    def title_initials(title: str) -> str:
+        """제목 초성 문자열 (initials 열에 미리 계산해 저장)"""
+        return initials(fold(title))
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        conn.executescript('''
+            CREATE TABLE IF NOT EXISTS links (
+                id INTEGER PRIMARY KEY,
+                position INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                description TEXT NOT NULL DEFAULT '',
+                url TEXT NOT NULL,
+                category TEXT NOT NULL DEFAULT '0',
+                initials TEXT NOT NULL DEFAULT ''
+            );
+            CREATE INDEX IF NOT EXISTS idx_links_category ON links(category);
+            -- 정렬은 메모리에서 하므로 예전 정렬용 인덱스는 지움 (쓰기마다 갱신 비용만 듦)
+            DROP INDEX IF EXISTS idx_links_title;
+            DROP INDEX IF EXISTS idx_links_url;
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        ''')
+
+        # 초성 열이 없던 데이터베이스는 열을 추가하고 한 번 채움
+        columns = [row[1] for row in conn.execute('PRAGMA table_info(links)')]
+        if 'initials' not in columns:
+            conn.execute("ALTER TABLE links ADD COLUMN initials TEXT NOT NULL DEFAULT ''")
+            conn.executemany(
+                'UPDATE links SET initials = ? WHERE id = ?',
+                [(self.title_initials(title), row_id) for row_id, title in conn.execute('SELECT id, title FROM links')]
+            )
+
+        # trigram 토크나이저(SQLite 3.34+)가 있으면 부분 문자열 검색, 없으면 instr 스캔으로 대체
+        try:
+            conn.execute(
+                'CREATE VIRTUAL TABLE IF NOT EXISTS links_fts USING fts5('
+                "title, description, url, content='links', content_rowid='id', tokenize='trigram')"
+            )
+            self.fts_mode = 'trigram'
+        except sqlite3.OperationalError:
+            Logger.warning('SQLite: FTS5 trigram 토크나이저를 사용할 수 없어 일반 검색으로 대체합니다')
+            self.fts_mode = None
+
+        if self.fts_mode:
+            conn.executescript('''
+                CREATE TRIGGER IF NOT EXISTS links_ai AFTER INSERT ON links BEGIN
+                    INSERT INTO links_fts(rowid, title, description, url)
+                    VALUES (new.id, new.title, new.description, new.url);
+                END;
+                CREATE TRIGGER IF NOT EXISTS links_ad AFTER DELETE ON links BEGIN
+                    INSERT INTO links_fts(links_fts, rowid, title, description, url)
+                    VALUES ('delete', old.id, old.title, old.description, old.url);
+                END;
+                CREATE TRIGGER IF NOT EXISTS links_au AFTER UPDATE ON links BEGIN
+                    INSERT INTO links_fts(links_fts, rowid, title, description, url)
+                    VALUES ('delete', old.id, old.title, old.description, old.url);
+                    INSERT INTO links_fts(rowid, title, description, url)
+                    VALUES (new.id, new.title, new.description, new.url);
+                END;
+            ''')
+        conn.commit()
+
+    # ---------------- 읽기 ----------------
+    def load(self) -> List[Dict[str, Any]]:
+        conn = self._connect()
+        self._create_schema(conn)
+        self._migrate_from_json(conn)
+        self._reader = conn
+        links = [
+            self._row_to_link(row)
+            for row in conn.execute('SELECT id, title, description, url, category FROM links ORDER BY position')
+        ]
+        self.next_id = max((link['id'] for link in links), default=0) + 1
+        return links
+
+    def load_async(self, first_batch: int, on_batch: Callable, on_done: Callable, on_error: Callable) -> None:
+        """데이터베이스 열기와 읽기를 백그라운드 스레드에서
+
+        처음 한 번 links.json 을 옮기는 작업 (JournalStore 읽기, 압축, links.bin 기록) 도
+        여기서 하므로 그동안 UI 가 멈추지 않는다.
+        """
+        def run():
+            try:
+                links = self.load()
+            except Exception as e:
+                on_error(e)
+                return
+            on_batch(links, len(links), len(links))
+            on_done(links)
+
+        threading.Thread(target=run, name='SqliteLoader', daemon=True).start()
+
+    def _migrate_from_json(self, conn: sqlite3.Connection) -> None:
+        """links.json (+ 남은 저널) 을 한 번만 데이터베이스로 옮김"""
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'migrated'").fetchone():
+            return
+
+        links = []
+        if self.json_path.exists():
+            legacy = JournalStore(self.json_path)
+            try:
+                links = legacy.load()
+                # 남은 저널을 links.json 에 합쳐 내보내기 파일을 최신으로 유지
+                legacy.compact(links)
+            finally:
+                legacy.close()
+
+        with conn:
+            conn.executemany(
+                'INSERT INTO links (id, position, title, description, url, category, initials) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [
+                    (link['id'], i, link.get('title', ''), link.get('description', ''),
+                     link.get('url', ''), link.get('category', '0'), self.title_initials(link.get('title', '')))
+                    for i, link in enumerate(links)
+                ]
+            )
+            conn.execute("INSERT INTO meta (key, value) VALUES ('migrated', ?)", (str(len(links)),))
+        Logger.info(f'SQLite: links.json 에서 {len(links)}개 링크를 옮겼습니다')
+
+    @staticmethod
+    def _row_to_link(row) -> Dict[str, Any]:
+        return {'id': row[0], 'title': row[1], 'description': row[2], 'url': row[3], 'category': row[4]}
+
+    # 필드 지정 검색어의 열 이름
+    FIELD_COLUMNS = {'title': 'title', 'desc': 'description', 'url': 'url'}
+
+    def _term_condition(self, term: str):
+        """검색어 하나를 SQL 조건과 인자로 변환 (title:/desc:/url: 은 그 열만, cat: 은 분류 번호)"""
+        field, term = split_field(term)
+        if field == 'cat':
+            ids = category_ids(term)
+            return f"category IN ({', '.join('?' * len(ids))})", list(ids)
+        column = self.FIELD_COLUMNS.get(field)
+        if self.fts_mode == 'trigram' and len(term) >= 3:
+            phrase = '"' + term.replace('"', '""') + '"'
+            if column is not None:
+                # FTS5 열 필터
+                phrase = f'{column} : {phrase}'
+            sql, args = 'id IN (SELECT rowid FROM links_fts WHERE links_fts MATCH ?)', [phrase]
+        elif column is not None:
+            sql, args = f'(instr(lower({column}), ?) > 0)', [term]
+        else:
+            sql, args = (
+                '(instr(lower(title), ?) > 0 OR instr(lower(description), ?) > 0 OR instr(lower(url), ?) > 0)',
+                [term, term, term]
+            )
+        if field in (None, 'title') and is_choseong(term):
+            # 초성 검색어는 미리 계산한 제목 초성 열에서도 찾음
+            sql, args = f'({sql} OR instr(initials, ?) > 0)', args + [term]
+        return sql, args
+
+    def _postfix_condition(self, postfix: List[str]):
+        """SearchParser 후위 표기 토큰을 SQL WHERE 조건으로 변환 (create_search_function 과 같은 규칙)"""
+        if not postfix:
+            return '1', []
+
+        stack = []
+        for token in postfix:
+            if token in ('OR', 'AND'):
+                if len(stack) < 2:
+                    continue
+                right_sql, right_args = stack.pop()
+                left_sql, left_args = stack.pop()
+                stack.append((f'({left_sql} {token} {right_sql})', left_args + right_args))
+            elif token == 'NOT':
+                if len(stack) < 1:
+                    continue
+                sql, args = stack.pop()
+                stack.append((f'(NOT {sql})', args))
+            elif is_fuzzy(token):
+                # SQL 로는 편집 거리를 계산하지 않으므로 ~ 를 뗀 부분 문자열 검색
+                # (앱의 검색은 ~검색어를 메모리의 단어 색인으로 평가함 - SearchJob.filter)
+                stack.append(self._term_condition(token[1:].lower()))
+            else:
+                stack.append(self._term_condition(token.lower()))
+
+        return stack[0] if stack else ('0', [])
+
+    def query_ids(self, postfix: List[str]) -> List[int]:
+        """검색식 (분류 조건은 cat: 검색어로 포함) 을 하나의 질의로 실행해 링크 id 목록 반환 (저장 순서)
+
+        대기 중인 기록을 마친 뒤 읽으므로 UI 스레드가 아닌 검색 작업 스레드에서 부른다.
+        """
+        self.flush()
+        where, args = self._postfix_condition(postfix)
+        sql = f'SELECT id FROM links WHERE {where} ORDER BY position'
+        with self._read_lock:
+            return [row[0] for row in self._reader.execute(sql, args)]
+
+    # ---------------- 쓰기 (저장 스레드) ----------------
+    def write_batch(self, batch: List[Any]) -> None:
+        if self._writer is None:
+            self._writer = self._connect()
+
+        conn = self._writer
+        with conn:
+            for kind, item in batch:
+                if kind == 'entry':
+                    self._apply(conn, item)
+
+        # 스냅샷 요청은 links.json 내보내기로 처리 (마지막 것만)
+        for kind, item in reversed(batch):
+            if kind == 'snapshot':
+                write_json_atomic(self.json_path, list(item))
+                break
+
+    def _apply(self, conn: sqlite3.Connection, entry: Dict[str, Any]) -> None:
+        op = entry.get('op')
+        if op == 'delete':
+            conn.execute('DELETE FROM links WHERE id = ?', (entry['id'],))
+            return
+
+        link = entry['link']
+        values = (link.get('title', ''), link.get('description', ''), link.get('url', ''), link.get('category', '0'),
+                  self.title_initials(link.get('title', '')))
+        if op == 'update':
+            conn.execute(
+                'UPDATE links SET title = ?, description = ?, url = ?, category = ?, initials = ? WHERE id = ?',
+                values + (link['id'],)
+            )
+        elif op == 'add':
+            conn.execute(
+                'INSERT INTO links (id, position, title, description, url, category, initials) '
+                'VALUES (?, (SELECT COALESCE(MAX(position), -1) + 1 FROM links), ?, ?, ?, ?, ?)',
+                # id 없는 추가 (읽기 실패 중 추가한 링크) 는 SQLite 가 새 id 를 줌
+                (link.get('id'),) + values
+            )
+
+    def close(self) -> None:
+        super().close()
+        with self._read_lock:
+            for conn in (self._reader, self._writer):
+                if conn is not None:
+                    conn.close()
+            self._reader = self._writer = None
+
+
+# ============================================================
+# 백그라운드 저장 스레드
+# ============================================================
+class PersistenceWorker(threading.Thread):
+    """저장 요청을 잠시 모았다가 한 번에 기록하는 스레드
+
+    연속된 수정은 delay 동안 모아 한 번의 쓰기/fsync 로 합친다.
+    """
+
+    def __init__(self, store: LinkStore, delay: float = 0.5):
+        super().__init__(name='PersistenceWorker', daemon=True)
+        self.store = store
+        self.delay = delay
+        self.write_stats = LatencyStats('디스크 기록')
+        self._queue: List[Any] = []
+        self._cond = threading.Condition()
+        self._busy = False
+        self._flush_requested = False
+        self._stopping = False
+
+    def submit(self, item: Any) -> None:
+        with self._cond:
+            self._queue.append(item)
+            self._cond.notify_all()
+
+    def run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopping:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+
+                # 디바운스: 첫 요청 후 delay 동안 이어지는 요청을 모은다
+                deadline = time.monotonic() + self.delay
+                while not self._stopping and not self._flush_requested:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                batch = self._queue
+                self._queue = []
+                self._busy = True
+
+            start = time.perf_counter()
+            try:
+                self.store.write_batch(batch)
+            except Exception as e:
+                Logger.error(f'링크 저장 실패: {e}')
+            finally:
+                self.write_stats.add(time.perf_counter() - start)
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def flush(self) -> None:
+        """대기 중인 요청을 즉시 기록하고 끝날 때까지 대기"""
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            while (self._queue or self._busy) and self.is_alive():
+                self._cond.wait(0.1)
+            self._flush_requested = False
+
+    def stop(self) -> None:
+        self.flush()
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self.join()
+
+# ============================================================
+# 지연 시간 측정
+# ============================================================
+class LatencyStats:
+    """저장 호출에 걸린 시간 통계 (초 단위로 기록, ms 로 보고)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def average(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self) -> str:
+        return (f'{self.name}: {self.count}회, 평균 {self.average * 1000:.2f}ms, '
+                f'최대 {self.max * 1000:.2f}ms, 마지막 {self.last * 1000:.2f}ms')
@@ -1,11 +1,11 @@
 # -*- coding: utf-8 -*-
 import os
-import json
 import webbrowser
 import threading
 from pathlib import Path
 import sys
 import io
+import time
 import weakref
 from typing import List, Dict, Any, Callable, Optional
 from functools import lru_cache
@@ -36,20 +36,28 @@ from kivy.uix.textinput import TextInput
 from kivy.uix.button import Button
 from kivy.uix.popup import Popup
 from kivy.uix.togglebutton import ToggleButton
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
 from kivy.core.window import Window
 from kivy.graphics import Color, Rectangle, RoundedRectangle
 from kivy.metrics import dp
-from kivy.clock import Clock
+from kivy.clock import Clock, mainthread
 from kivy.logger import Logger
 from kivy.utils import platform
 from kivy.animation import Animation
 
+from link_store import (JournalStore, SqliteLinkStore, LatencyStats, build_id_map, frozen_links,
+                        link_categories, link_sort_fields)
+from link_search import (SearchParser, BigramIndex, CategoryIndex, ViewCache, RankedResults, SortedOrders,
+                         SearchSnapshot, SearchJob, CATEGORIES, SORT_KEYS, fold)
+
 # 안드로이드 네이티브 컨텍스트 메뉴 사용 설정
 if platform == 'android':
     Window.softinput_mode = 'below_target'
 
 # Kivy 한글 폰트 설정
-from kivy.core.text import LabelBase
+from kivy.core.text import LabelBase, Label as CoreLabel
 from kivy.resources import resource_add_path
 
 # 안드로이드 환경 확인
@@ -75,6 +83,13 @@ else:
 
 DATA_DIR.mkdir(exist_ok=True, parents=True)
 
+# 저장 방식: 'journal' (links.json + 변경 저널) 또는 'sqlite' (links.db + FTS5 검색)
+STORAGE_BACKEND = 'journal'
+
+# 목록 표시 방식: 'recycle' (RecycleView - 화면에 보이는 줄만 위젯으로 만들고 스크롤하면 다시 채움)
+# 또는 'pages' (GridLayout 에 page_size 개씩 카드를 만들고 "더 보기...")
+LIST_MODE = 'recycle'
+
 # ============================================================
 # 마루부리 폰트 설정
 # ============================================================
@@ -139,20 +154,6 @@ COLORS = {
     'description_text': '#2D1B4E'
 }
 
-CATEGORIES = {
-    '0': '분류안함',
-    '1': '교육',
-    '2': '아이디어',
-    '3': '생활',
-    '4': '농업',
-    '5': '쇼핑',
-    '6': '여행',
-    '7': '비즈니스',
-    '8': '건강',
-    '9': '가정',
-    '10': '커뮤니티'
-}
-
 def hex_to_rgb(hex_color, alpha=1.0):
     hex_color = hex_color.lstrip('#')
     if len(hex_color) == 6:
@@ -208,143 +209,6 @@ class ClockManager:
                 pass
         cls._events.clear()
 
-# ============================================================
-# 검색 파서 (OR, AND, NOT 연산 지원)
-# ============================================================
-class SearchParser:
-    """검색어 파서 - OR, AND, NOT 연산 지원"""
-    
-    PRECEDENCE = {'NOT': 3, 'AND': 2, 'OR': 1}
-    
-    @classmethod
-    def tokenize(cls, query: str) -> List[str]:
-        """검색어를 토큰으로 분리"""
-        if not query or not query.strip():
-            return []
-        
-        tokens = []
-        i = 0
-        length = len(query)
-        
-        while i < length:
-            if query[i].isspace():
-                i += 1
-                continue
-            
-            if query[i] == '(':
-                tokens.append('(')
-                i += 1
-                continue
-            elif query[i] == ')':
-                tokens.append(')')
-                i += 1
-                continue
-            
-            upper_query = query[i:].upper()
-            if upper_query.startswith('OR'):
-                tokens.append('OR')
-                i += 2
-                continue
-            elif upper_query.startswith('AND'):
-                tokens.append('AND')
-                i += 3
-                continue
-            elif upper_query.startswith('NOT'):
-                tokens.append('NOT')
-                i += 3
-                continue
-            
-            if query[i] == '"':
-                j = i + 1
-                while j < length and query[j] != '"':
-                    j += 1
-                if j < length:
-                    tokens.append(query[i+1:j].strip())
-                    i = j + 1
-                else:
-                    tokens.append(query[i+1:].strip())
-                    i = length
-            else:
-                j = i
-                while j < length and not query[j].isspace() and query[j] not in '()':
-                    j += 1
-                tokens.append(query[i:j].strip())
-                i = j
-        
-        return [t for t in tokens if t]
-    
-    @classmethod
-    def infix_to_postfix(cls, tokens: List[str]) -> List[str]:
-        """중위 표기법을 후위 표기법으로 변환"""
-        output = []
-        stack = []
-        
-        for token in tokens:
-            if token in ('OR', 'AND', 'NOT'):
-                while (stack and stack[-1] != '(' and 
-                       cls.PRECEDENCE.get(stack[-1], 0) >= cls.PRECEDENCE.get(token, 0)):
-                    output.append(stack.pop())
-                stack.append(token)
-            elif token == '(':
-                stack.append(token)
-            elif token == ')':
-                while stack and stack[-1] != '(':
-                    output.append(stack.pop())
-                if stack and stack[-1] == '(':
-                    stack.pop()
-            else:
-                output.append(token.lower())
-        
-        while stack:
-            output.append(stack.pop())
-        
-        return output
-    
-    @classmethod
-    def create_search_function(cls, postfix_tokens: List[str]) -> Callable[[Dict[str, str]], bool]:
-        """후위 표기법 토큰을 검색 함수로 변환"""
-        if not postfix_tokens:
-            return lambda link: True
-        
-        stack = []
-        
-        for token in postfix_tokens:
-            if token == 'OR':
-                if len(stack) < 2:
-                    continue
-                right = stack.pop()
-                left = stack.pop()
-                stack.append(lambda link, l=left, r=right: l(link) or r(link))
-            elif token == 'AND':
-                if len(stack) < 2:
-                    continue
-                right = stack.pop()
-                left = stack.pop()
-                stack.append(lambda link, l=left, r=right: l(link) and r(link))
-            elif token == 'NOT':
-                if len(stack) < 1:
-                    continue
-                operand = stack.pop()
-                stack.append(lambda link, op=operand: not op(link))
-            else:
-                search_term = token.lower()
-                stack.append(lambda link, term=search_term: (
-                    term in link.get('title', '').lower() or
-                    term in link.get('description', '').lower() or
-                    term in link.get('url', '').lower()
-                ))
-        
-        return stack[0] if stack else lambda link: False
-    
-    @classmethod
-    def parse(cls, query: str) -> Callable[[Dict[str, str]], bool]:
-        """검색어를 파싱하여 검색 함수 반환"""
-        if not query or not query.strip():
-            return lambda link: True
-        tokens = cls.tokenize(query)
-        postfix = cls.infix_to_postfix(tokens)
-        return cls.create_search_function(postfix)
-
 # ============================================================
 # 키보드 대응 팝업 클래스 (66px 이동)
 # ============================================================
@@ -760,8 +624,31 @@ class CategoryToggleButton(ToggleButton):
         self.group = 'categories'
         self.font_name = get_font_name()
 
+# ============================================================
+# 글자 크기 측정
+# ============================================================
+@lru_cache(maxsize=4096)
+def measure_text(text: str, width: Optional[float], font_size: float, bold: bool = False):
+    """글자가 차지할 (폭, 높이) - width 가 있으면 그 폭에서 줄을 바꾼 크기
+
+    텍스처는 만들지 않고 줄 배치만 계산한다. 같은 글자/폭/크기는 다시 재지 않음.
+    """
+    label = CoreLabel(
+        text=text,
+        font_size=font_size,
+        font_name=get_font_name() or 'Roboto',
+        bold=bold,
+        text_size=(width, None)
+    )
+    label.resolve_font_name()
+    return label.render()
+
 class LinkCard(BoxLayout):
-    def __init__(self, title, description, url, category, index, delete_callback, edit_callback, **kwargs):
+    # 설명 라벨의 줄바꿈 폭 - 마지막으로 배치된 카드의 설명 폭 (카드는 모두 같은 폭)
+    # 새 카드는 이 폭으로 먼저 재고, 배치 뒤 폭이 다르면 update_desc_width 에서 다시 잼
+    desc_width = dp(350)
+    
+    def __init__(self, title, description, url, category, link_id, delete_callback, edit_callback, **kwargs):
         super().__init__(**kwargs)
         self.orientation = 'horizontal'
         self.size_hint_y = None
@@ -770,7 +657,7 @@ class LinkCard(BoxLayout):
         self.title = title
         self.url = url
         self.category = category
-        self.index = index
+        self.link_id = link_id
         self.delete_callback = delete_callback
         self.edit_callback = edit_callback
         self._weak_ref = weakref.ref(self)
@@ -786,7 +673,7 @@ class LinkCard(BoxLayout):
         content_layout = BoxLayout(orientation='vertical', size_hint=(0.65, 1))
         font_name = get_font_name()
         
-        title_label = Label(
+        self.title_label = title_label = Label(
             text=title,
             size_hint_y=None,
             height=dp(30),
@@ -798,20 +685,21 @@ class LinkCard(BoxLayout):
         )
         title_label.bind(texture_size=title_label.setter('size'))
         
-        desc_label = Label(
+        self.desc_label = desc_label = Label(
             text=description,
             size_hint_y=None,
             color=hex_to_rgb(COLORS['text_primary']),
             font_size=dp(14),
-            text_size=(dp(350), None),
+            text_size=(LinkCard.desc_width, None),
             halign='left',
             valign='top',
             font_name=font_name
         )
         desc_label.bind(texture_size=lambda i, v: setattr(i, 'height', max(v[1], dp(40))))
+        desc_label.bind(width=self.update_desc_width)
         
         short_url = url[:50] + "..." if len(url) > 50 else url
-        url_label = Label(
+        self.url_label = url_label = Label(
             text=short_url,
             size_hint_y=None,
             height=dp(20),
@@ -828,7 +716,7 @@ class LinkCard(BoxLayout):
         
         right_layout = BoxLayout(orientation='vertical', size_hint=(0.3, 1), spacing=dp(5))
         
-        category_label = Label(
+        self.category_label = category_label = Label(
             text=CATEGORIES.get(category, '분류안함'),
             size_hint_y=None,
             height=dp(25),
@@ -868,26 +756,45 @@ class LinkCard(BoxLayout):
         self.add_widget(right_layout)
         
         self.bind(pos=self.update_rect, size=self.update_rect)
-        Clock.schedule_once(self.calculate_height, 0.1)
+        self.calculate_height()
     
-    def calculate_height(self, dt):
+    def calculate_height(self, dt=None):
+        """라벨 글자 크기를 재서 카드 높이를 바로 정함 (텍스처가 그려지기를 기다리지 않음)"""
         base_height = self.padding[1] + self.padding[3] + self.spacing * 2
-        content_height = 0
-        if len(self.children) > 0:
-            content_layout = self.children[1]
-            for child in content_layout.children:
-                content_height += child.height
-        
-        right_height = 0
-        if len(self.children) > 0:
-            right_layout = self.children[0]
-            for child in right_layout.children:
-                right_height += child.height
-            right_height += right_layout.spacing * (len(right_layout.children) - 1)
+        title_label, desc_label, url_label = self.title_label, self.desc_label, self.url_label
+        # 라벨 높이도 여기서 맞춤 (글자를 바꾼 라벨은 texture_size 가 안 바뀌기도 함 - 빈 설명)
+        title_label.height = measure_text(title_label.text, None, title_label.font_size, True)[1]
+        desc_label.height = max(measure_text(desc_label.text, desc_label.text_size[0], desc_label.font_size)[1], dp(40))
+        url_label.height = measure_text(url_label.text, None, url_label.font_size)[1]
+        content_height = title_label.height + desc_label.height + url_label.height
+        
+        right_layout = self.children[0]
+        right_height = sum(child.height for child in right_layout.children)
+        right_height += right_layout.spacing * (len(right_layout.children) - 1)
         
         final_height = max(content_height, right_height) + base_height
         self.height = max(final_height, dp(100))
     
+    def update_desc_width(self, label, width):
+        """설명 라벨 폭이 바뀌면 그 폭에서 줄을 바꾸고 카드 높이를 다시 잼"""
+        if width <= 0 or width == label.text_size[0]:
+            return
+        LinkCard.desc_width = width
+        label.text_size = (width, label.text_size[1])
+        self.calculate_height()
+    
+    def set_link(self, title, description, url, category, link_id):
+        """카드에 보일 링크를 바꿈 (위젯은 그대로 두고 글자만 다시 채움)"""
+        self.title = title
+        self.url = url
+        self.category = category
+        self.link_id = link_id
+        self.title_label.text = title
+        self.desc_label.text = description
+        self.url_label.text = url[:50] + "..." if len(url) > 50 else url
+        self.category_label.text = CATEGORIES.get(category, '분류안함')
+        self.calculate_height()
+    
     def update_rect(self, *args):
         self.rect.pos = self.pos
         self.rect.size = self.size
@@ -898,10 +805,10 @@ class LinkCard(BoxLayout):
             self.category_bg.size = self.children[0].children[1].size
     
     def delete_link(self, instance):
-        self.delete_callback(self.index)
+        self.delete_callback(self.link_id)
     
     def edit_link(self, instance):
-        self.edit_callback(self.index)
+        self.edit_callback(self.link_id)
     
     def on_touch_down(self, touch):
         if len(self.children) > 0 and self.children[1].collide_point(*touch.pos):
@@ -917,6 +824,298 @@ class LinkCard(BoxLayout):
                 Logger.error(f'LinkCard: URL 열기 실패: {e}')
         threading.Thread(target=_open).start()
 
+class CardPool:
+    """목록을 다시 그릴 때 쓸 LinkCard 모음 ('pages' 목록)
+
+    목록에서 뺀 카드를 모아 두었다가 다음 새로 그릴 때 set_link 로 다른 링크를 채워 다시
+    쓴다. 라벨/캔버스/버튼을 새로 만들지 않고, 글자가 같은 라벨은 텍스처도 그대로 쓴다.
+    남는 카드는 limit 개까지 둔다 - 한 번에 다시 그리는 카드 수 (max_cards) 를 넘길 필요는 없다.
+    기본 목록 ('recycle') 은 RecycleView 가 LinkRow 를 다시 쓰므로 이 모음을 쓰지 않는다.
+    """
+    
+    def __init__(self, delete_callback, edit_callback, limit: int):
+        self.delete_callback = delete_callback
+        self.edit_callback = edit_callback
+        self.limit = limit
+        self._free: List[LinkCard] = []
+        self.created = 0
+        self.reused = 0
+    
+    def acquire(self, link) -> LinkCard:
+        """link 를 보여 줄 카드 - 남는 카드가 있으면 그 카드에 다시 채움"""
+        category = link.get('category', '0')
+        if not self._free:
+            self.created += 1
+            return LinkCard(
+                link['title'],
+                link['description'],
+                link['url'],
+                category,
+                link['id'],
+                self.delete_callback,
+                self.edit_callback
+            )
+        self.reused += 1
+        card = self._free.pop()
+        card.set_link(link['title'], link['description'], link['url'], category, link['id'])
+        return card
+    
+    def release(self, widgets):
+        """목록에서 뺀 위젯 중 카드를 모아 둠 (limit 개까지)"""
+        for widget in widgets:
+            if isinstance(widget, LinkCard) and len(self._free) < self.limit:
+                self._free.append(widget)
+
+class CardBuilder:
+    """'pages' 목록 카드를 프레임마다 budget 초 안에서 나눠 만들어 붙임
+
+    링크 순서대로 만드는데 목록을 새로 그리면 맨 위부터, 더 보기는 보던 자리 바로 아래부터
+    붙으므로 화면에 보이는 카드가 먼저 만들어진다. 첫 조각은 부른 자리에서 바로, 나머지는
+    다음 프레임부터 Clock 으로 이어 만든다. 조각마다 걸린 시간을 stats 에 모으고 예산을
+    넘긴 조각 수를 센다.
+    """
+    
+    def __init__(self, pool: CardPool, layout, budget: float = 0.008):
+        self.pool = pool
+        self.layout = layout
+        self.budget = budget
+        self.stats = LatencyStats('카드 만들기 조각')
+        self.over_budget = 0
+        self._links: List[Dict] = []
+        self._next = 0
+        self._event = None
+        self._on_slice = None
+        self._on_done = None
+        # 카드 하나 만드는 데 걸리는 시간 (이동 평균) - 다음 카드가 예산을 넘길지 미리 봄
+        self._card_cost = 0.0
+        self._slices = 0
+        self._slices_over = 0
+        self._started = 0.0
+    
+    @property
+    def busy(self) -> bool:
+        return self._next < len(self._links)
+    
+    def start(self, links, on_slice: Callable, on_done: Callable):
+        """links 카드를 만들기 시작 - 조각마다 on_slice(), 다 만들면 on_done()"""
+        self.cancel()
+        self._links = links
+        self._on_slice = on_slice
+        self._on_done = on_done
+        self._slices = self._slices_over = 0
+        self._started = time.perf_counter()
+        if self._step(0) is not False:
+            self._event = Clock.schedule_interval(self._step, 0)
+    
+    def cancel(self):
+        """만들던 카드는 그만 만듦 (이미 붙인 카드는 그대로)"""
+        if self._event is not None:
+            self._event.cancel()
+            self._event = None
+        self._links = []
+        self._next = 0
+    
+    def _step(self, dt):
+        start = time.perf_counter()
+        links = self._links
+        add_widget = self.layout.add_widget
+        acquire = self.pool.acquire
+        while self._next < len(links):
+            card_start = time.perf_counter()
+            add_widget(acquire(links[self._next]))
+            self._next += 1
+            now = time.perf_counter()
+            self._card_cost = (self._card_cost * 3 + now - card_start) / 4
+            if now - start + self._card_cost > self.budget:
+                break
+        self._on_slice()
+        
+        elapsed = time.perf_counter() - start
+        self.stats.add(elapsed)
+        self._slices += 1
+        if elapsed > self.budget:
+            self._slices_over += 1
+            self.over_budget += 1
+        if self._next < len(links):
+            return True
+        
+        Logger.info(
+            f'카드 만들기: {len(links)}개, {self._slices}프레임 '
+            f'(예산 {self.budget * 1000:.0f}ms 넘은 프레임 {self._slices_over}개), '
+            f'{(time.perf_counter() - self._started) * 1000:.0f}ms'
+        )
+        on_done = self._on_done
+        self.cancel()
+        on_done()
+        return False
+
+class LinkRow(RecycleDataViewBehavior, LinkCard):
+    """RecycleView 목록의 한 줄 - LinkCard 와 같은 모양에 높이만 고정 (설명은 두 줄까지)
+
+    화면에 보이는 줄만 만들어지고, 스크롤하면 refresh_view_attrs 로 다른 링크를 채운다.
+    data 항목에는 아무것도 없고 줄 번호로 LinkList.owner.row_link() 에서 링크를 가져온다.
+    """
+    HEIGHT = dp(130)
+    
+    def __init__(self, **kwargs):
+        super().__init__('', '', '', '0', None, None, None, **kwargs)
+        self.height = self.HEIGHT
+        self.desc_label.text_size = (LinkCard.desc_width, dp(40))
+        self.desc_label.shorten = True
+        self.desc_label.max_lines = 2
+    
+    def calculate_height(self, dt=None):
+        # 줄 높이는 고정 (RowLayout 의 default_size)
+        pass
+    
+    def refresh_view_attrs(self, rv, index, data):
+        owner = rv.owner
+        link = owner.row_link(index)
+        self.delete_callback = owner.delete_link
+        self.edit_callback = owner.edit_link
+        self.set_link(link['title'], link['description'], link['url'], link.get('category', '0'), link['id'])
+        return super().refresh_view_attrs(rv, index, data)
+
+class RowOpts:
+    """RowLayout.view_opts - 줄 번호로 그 줄의 크기/위치 dict 를 그때 만들어 줌"""
+    __slots__ = ('layout', 'count')
+    
+    def __init__(self, layout, count):
+        self.layout = layout
+        self.count = count
+    
+    def __len__(self):
+        return self.count
+    
+    def __getitem__(self, index):
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return self.layout.row_opts(index)
+
+
+class RowLayout(RecycleBoxLayout):
+    """줄 높이가 모두 같은 RecycleView 목록의 레이아웃 - 줄 위치를 줄 번호로 바로 계산
+
+    RecycleBoxLayout 은 줄 수가 바뀔 때마다 모든 줄의 크기/위치 dict 를 만들어 위치를
+    다시 계산하고, 보이는 줄을 찾을 때도 위치 목록을 앞에서부터 훑는다 (줄 수에 비례).
+    LinkRow 는 높이가 고정 (default_size) 이라 줄 i 의 위치는 i 만으로 정해지므로
+    view_opts 는 요청한 줄의 dict 만 만들고 (RowOpts), 보이는 줄 번호는 나눗셈으로 구한다.
+    줄 수와 상관없이 보이는 줄 수에 비례하는 일만 한다.
+    """
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._geometry = None
+    
+    def row_step(self):
+        return self.default_size[1] + self.spacing
+    
+    def row_opts(self, index):
+        left, top, right, _ = self.padding
+        height = self.default_size[1]
+        y = self.y + self.height - top - height - index * self.row_step()
+        return {
+            'size': [max(0, self.width - left - right), height],
+            'size_hint': list(self.default_size_hint),
+            'size_hint_min': list(self.default_size_hint_min),
+            'size_hint_max': list(self.default_size_hint_max),
+            'pos': [self.x + left, y],
+            'pos_hint': self.default_pos_hint,
+            'viewclass': self.viewclass,
+            'width_none': False,
+            'height_none': False,
+        }
+    
+    def compute_sizes_from_data(self, data, flags):
+        # 줄이 바뀌었으므로 보이는 줄은 다시 채움
+        self.clear_layout()
+        self.view_opts = RowOpts(self, len(data))
+        self._geometry = None
+    
+    def compute_layout(self, data, flags):
+        self._size_needs_update = False
+        self._changed_views = None
+        count = len(data)
+        left, top, right, bottom = self.padding
+        height = self.default_size[1]
+        self.minimum_size = (left + right,
+                             top + bottom + count * height + max(count - 1, 0) * self.spacing)
+        geometry = (count, tuple(self.pos), tuple(self.size), tuple(self.padding), self.spacing, height)
+        if geometry != self._geometry:
+            # 위치/크기가 바뀌면 보이는 줄을 새 자리에 다시 놓음
+            self._geometry = geometry
+            self.clear_layout()
+    
+    def get_view_index_at(self, pos):
+        count = len(self.view_opts)
+        if not count:
+            return 0
+        top = self.y + self.height - self.padding[1]
+        return min(max(int((top - pos[1]) // self.row_step()), 0), count - 1)
+    
+    def compute_visible_views(self, data, viewport):
+        count = len(data)
+        if not count:
+            return []
+        x, y, w, h = viewport
+        top = self.y + self.height - self.padding[1]
+        step = self.row_step()
+        # 줄 i 는 top - i * step 에서 아래로 default_size 높이만큼
+        first = max(int((top - (y + h)) // step), 0)
+        last = min(int((top - y) // step), count - 1)
+        return list(range(first, last + 1))
+
+
+class LinkList(RecycleView):
+    """링크 목록 (RecycleView) - 스크롤해도 위젯 수는 화면에 보이는 줄만큼으로 일정
+
+    data 는 줄마다 같은 빈 dict (ROW) 를 가리키는 목록이라 링크 수에 비례하는 것은 참조뿐이다.
+    owner 는 줄 번호로 링크를 주는 LinkApp.
+    """
+    ROW = {}
+    
+    def __init__(self, owner, **kwargs):
+        super().__init__(**kwargs)
+        self.owner = owner
+        self.do_scroll_x = False
+        layout = RowLayout(
+            orientation='vertical',
+            default_size=(None, LinkRow.HEIGHT),
+            default_size_hint=(1, None),
+            size_hint_y=None,
+            spacing=dp(15),
+            padding=dp(10)
+        )
+        layout.bind(minimum_height=layout.setter('height'))
+        self.add_widget(layout)
+        # viewclass 는 레이아웃 관리자에 넘겨지므로 레이아웃을 붙인 뒤에 정함
+        self.viewclass = LinkRow
+    
+    def show(self, count, scroll_top=True):
+        """줄 수를 count 로 맞추고 보이는 줄을 다시 채움 (같은 수여도 순서가 바뀌었을 수 있음)
+
+        data 를 새로 만들지 않고 늘어나거나 줄어든 만큼만 붙이거나 뗀다 (RowLayout 은 줄 수만
+        봄). 줄 수가 같으면 (수정, 같은 수의 다른 순서) 보이는 줄만 다시 채운다.
+        """
+        data = self.data
+        if count > len(data):
+            data.extend([self.ROW] * (count - len(data)))
+        elif count < len(data):
+            del data[count:]
+        else:
+            self.refresh_rows()
+        if scroll_top:
+            self.scroll_y = 1
+    
+    def refresh_rows(self):
+        """보이는 줄만 지금 링크로 다시 채움
+
+        refresh_from_viewport() 는 이미 보이는 줄을 다시 채우지 않으므로 (새로 보이게 된
+        줄만 채움) 보이는 줄 위젯에 직접 refresh_view_attrs 를 부른다.
+        """
+        for view, index in list(self.layout_manager.view_indices.items()):
+            view.refresh_view_attrs(self, index, self.ROW)
+
 # ============================================================
 # 메인 앱 클래스
 # ============================================================
@@ -927,37 +1126,202 @@ class LinkApp(BoxLayout):
         self.padding = dp(15)
         self.spacing = dp(15)
         self.links = []
+        self.link_map = {}
+        self.search_index = None
+        # 분류별 링크 id 비트맵과 개수 - 다 읽은 뒤 만들고 추가/수정/삭제마다 갱신 (읽는 중에는 None)
+        self.categories = None
+        # 제목/주소 순 정렬 목록 - 다 읽은 뒤 백그라운드에서 만들고 추가/수정/삭제마다 갱신
+        # (읽는 중과 만드는 동안에는 None)
+        self.sorted_orders = None
+        self.views = ViewCache()
+        self._index_pending = None
+        self._orders_pending = None
+        self._last_search = None
+        self._search_event = None
+        self.search_delay = 0.3
+        # 검색 결과 순서: 마지막 검색이 오타 허용으로 바뀐 식, 앞에서부터 순서를 정하는 힙 (RankedResults)
+        self._fuzzy_postfix = None
+        self._ranking = None
+        # 백그라운드 검색: 실행 중인 작업, 작업에 넘기는 스냅샷, 데이터 버전, 스냅샷 이후 바뀐 링크 id
+        self._search_job = None
+        self._search_snapshot = None
+        self._data_version = 0
+        self._changed_ids = set()
         self.displayed_links = []
+        # RecycleView 목록의 줄 순서대로의 링크 (displayed_links 또는 plain_links())
+        self._row_links = []
         self.data_file = DATA_DIR / 'links.json'
+        if STORAGE_BACKEND == 'sqlite':
+            self.storage = SqliteLinkStore(DATA_DIR / 'links.db', self.data_file)
+        else:
+            self.storage = JournalStore(self.data_file)
+        self.save_stats = LatencyStats('UI 저장 호출')
         self.current_sort = 'title_asc'
         self.search_mode = False
         self.selected_category = 'all'
         self.current_page = 0
         self.page_size = 20
-        self._refresh_trigger = None
+        # 'pages' 목록에 한 번에 두는 카드 수 - 더 보기로 넘치면 위쪽 (먼저 보인) 카드부터 뺌
+        self.max_cards = 100
+        # 읽는 동안 RecycleView 줄 수를 늘리는 간격 (초) - 배치마다 늘리지 않고 모아서 늘림
+        self.rows_interval = 0.5
+        self._rows_event = None
+        self.loading = False
+        # 읽기에 실패하면 id 를 확정할 수 없으므로 읽는 중과 같이 임시 id/보류 기록을 씀
+        self.load_failed = False
+        self._ops_during_load = []
+        self._temp_id = 0
         self.clock_manager = ClockManager()
         
+        # 화면을 먼저 만들고, 링크는 읽히는 대로 첫 페이지부터 표시
+        self.clock_manager.schedule_once(self.setup_ui, 0.1)
         self.clock_manager.schedule_once(self.load_links, 0.1)
-        self.clock_manager.schedule_once(self.setup_ui, 0.2)
-        self.clock_manager.schedule_once(self.refresh_link_list, 0.3)
     
     def on_stop(self):
         """앱 종료 시 정리"""
         self.clock_manager.cancel_all()
+        self.cancel_search()
         self.save_links()
+        self.storage.close()
+        Logger.info(f'저장: {self.save_stats.summary()}')
+        Logger.info(f'저장: {self.storage.worker.write_stats.summary()}')
+        if LIST_MODE == 'pages' and hasattr(self, 'card_builder'):
+            self.card_builder.cancel()
+            Logger.info(f'목록: {self.card_builder.stats.summary()}, '
+                        f'예산 넘은 프레임 {self.card_builder.over_budget}개')
     
     def load_links(self, dt=None):
-        try:
-            if self.data_file.exists():
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    loaded_links = json.load(f)
-                    for link in loaded_links:
-                        if 'category' not in link:
-                            link['category'] = '0'
-                    self.links = loaded_links
-        except Exception as e:
-            Logger.error(f'링크 로드 실패: {e}')
-            self.links = []
+        """링크를 백그라운드에서 읽으며 첫 page_size 개가 모이면 바로 표시"""
+        self.loading = True
+        self.load_failed = False
+        self.links = []
+        self.link_map = {}
+        self.categories = None
+        self.sorted_orders = None
+        self._orders_pending = None
+        self.update_loading_label(0, None)
+        self.storage.load_async(
+            self.page_size,
+            on_batch=self.on_links_batch,
+            on_done=self.on_links_loaded,
+            on_error=self.on_links_load_failed
+        )
+    
+    @mainthread
+    def on_links_batch(self, batch, loaded, total):
+        """읽기 중간 결과 - 현재 페이지가 덜 찼을 때만 목록을 다시 그림"""
+        if not self.loading:
+            return
+        shown_before = len(self.links)
+        self.links.extend(batch)
+        for link in batch:
+            self.link_map[link['id']] = link
+        self._last_search = None
+        self.update_loading_label(loaded, total)
+        if self.search_mode:
+            return
+        if LIST_MODE == 'recycle':
+            # 줄 수만 늘림 (스크롤 위치는 그대로) - 첫 화면이 차면 rows_interval 에 한 번만
+            if shown_before < self.page_size:
+                self.refresh_link_rows(scroll_top=False)
+            elif self._rows_event is None:
+                self._rows_event = self.clock_manager.schedule_once(self.grow_link_rows, self.rows_interval)
+        elif shown_before < (self.current_page + 1) * self.page_size:
+            self.refresh_link_list()
+    
+    def grow_link_rows(self, dt=None):
+        """읽는 중 모아 둔 줄 수 늘리기 (on_links_batch)"""
+        self._rows_event = None
+        if self.loading and not self.search_mode:
+            self.refresh_link_rows(scroll_top=False)
+    
+    @mainthread
+    def on_links_loaded(self, links):
+        """읽기 완료 - 읽는 동안 한 수정 사항을 반영해 최종 목록으로 교체"""
+        # 바이너리 스냅샷 레코드는 항상 분류가 있으므로 JSON 에서 읽은 목록만 확인
+        if isinstance(links, list):
+            for link in links:
+                if 'category' not in link:
+                    link['category'] = '0'
+        self.links = links
+        self.link_map = build_id_map(links)
+        self.search_index = None
+        self.sorted_orders = None
+        self.views.clear()
+        self._index_pending = None
+        self._orders_pending = None
+        self._last_search = None
+        self._search_snapshot = None
+        self._changed_ids = set()
+        self._data_version += 1
+        self.loading = False
+        
+        # 읽는 동안 미뤄 둔 수정 사항 - 임시 id 로 추가한 링크는 이제 실제 id 를 받음
+        ops, self._ops_during_load = self._ops_during_load, []
+        for op, link in ops:
+            if op == 'add':
+                link['id'] = self.storage.new_id()
+                self.links.append(link)
+                self.link_map[link['id']] = link
+            elif op == 'update':
+                # 임시 id 링크의 수정은 위의 추가 기록 (같은 dict) 에 이미 들어 있음
+                record = self.link_map.get(link['id'])
+                if record is None:
+                    continue
+                # 읽기 스레드가 저널을 재생하며 같은 레코드를 예전 값으로 덮었을 수 있으므로 항상 다시 적용
+                record.update(link)
+            elif op == 'delete':
+                record = self.link_map.pop(link['id'], None)
+                if record is None:
+                    continue
+                self.links.remove(record)
+            self.journal(op, link)
+        self.categories = CategoryIndex.build(link_categories(self.links))
+        # 첫 목록은 저장 순서로 그리고, 정렬 목록이 다 만들어지면 current_sort 순으로 다시 그림
+        self.start_orders_build()
+        self.update_loading_label(len(links), len(links))
+        
+        if self.search_mode:
+            self.search_links(None)
+        else:
+            self.refresh_link_list()
+    
+    @mainthread
+    def on_links_load_failed(self, error):
+        """읽기 실패 - 읽은 만큼과 그동안 한 수정은 그대로 두고, 수정은 계속 보류
+
+        다음 id 를 알 수 없으므로 임시 id 를 계속 쓰고, 보류한 수정은 종료할 때
+        저널에만 기록한다 (write_pending_ops). 일부만 읽은 목록으로 links.json 을
+        덮어쓰지 않도록 압축은 하지 않는다.
+        """
+        Logger.error(f'링크 로드 실패: {error}')
+        self.loading = False
+        self.load_failed = True
+        self._last_search = None
+        self.update_loading_label(0, 0)
+        self.refresh_link_list()
+    
+    @property
+    def ids_pending(self):
+        """링크 id 가 아직 확정되지 않음 (읽는 중이거나 읽기 실패) - 임시 id 가 섞여 있을 수 있음"""
+        return self.loading or self.load_failed
+    
+    def update_loading_label(self, loaded, total):
+        if not hasattr(self, 'loading_label'):
+            return
+        if self.load_failed:
+            self.loading_label.text = '링크를 불러오지 못했습니다 - 수정 사항은 종료할 때 저널에 기록됩니다'
+            self.loading_label.height = dp(25)
+            return
+        if not self.loading:
+            self.loading_label.text = ''
+            self.loading_label.height = 0
+            return
+        if total is None:
+            self.loading_label.text = '링크 불러오는 중...'
+        else:
+            self.loading_label.text = f'링크 불러오는 중... {loaded:,} / {total:,}'
+        self.loading_label.height = dp(25)
     
     def setup_ui(self, dt=None):
         self.setup_promotion_buttons()
@@ -1012,6 +1376,7 @@ class LinkApp(BoxLayout):
             foreground_color=hex_to_rgb(COLORS['text_primary']),
             font_name=font_name
         )
+        self.search_input.bind(text=self.on_search_text)
         
         self.category_btn = Button(
             text='전체포함',
@@ -1021,13 +1386,13 @@ class LinkApp(BoxLayout):
         )
         self.category_btn.bind(on_press=self.show_category_popup)
         
-        search_btn = Button(
+        self.search_btn = Button(
             text='검색',
             size_hint=(0.135, 1),
             background_color=hex_to_rgb(COLORS['primary']),
             font_name=font_name
         )
-        search_btn.bind(on_press=self.search_links)
+        self.search_btn.bind(on_press=self.search_links)
         
         clear_btn = Button(
             text='전체',
@@ -1039,7 +1404,7 @@ class LinkApp(BoxLayout):
         
         search_category_layout.add_widget(self.search_input)
         search_category_layout.add_widget(self.category_btn)
-        search_category_layout.add_widget(search_btn)
+        search_category_layout.add_widget(self.search_btn)
         search_category_layout.add_widget(clear_btn)
         
         sort_layout = BoxLayout(size_hint_y=None, height=dp(50), spacing=dp(6))
@@ -1048,13 +1413,14 @@ class LinkApp(BoxLayout):
             ('제목↑', 'title_asc'),
             ('제목↓', 'title_desc'),
             ('주소↑', 'url_asc'),
-            ('주소↓', 'url_desc')
+            ('주소↓', 'url_desc'),
+            ('관련도', 'relevance')
         ]
         
         for text, sort_type in sort_buttons:
             btn = Button(
                 text=text,
-                size_hint=(0.25, 1),
+                size_hint=(0.2, 1),
                 background_color=hex_to_rgb(COLORS['primary_light']),
                 font_name=font_name
             )
@@ -1085,14 +1451,21 @@ class LinkApp(BoxLayout):
         category_layout = GridLayout(cols=1, size_hint_y=None, spacing=dp(5))
         category_layout.bind(minimum_height=category_layout.setter('height'))
         
-        all_btn = CategoryToggleButton(text='전체 포함')
+        # 분류별 개수는 CategoryIndex 가 들고 있는 값 그대로 (읽는 중이면 개수 없이 표시)
+        categories = self.categories
+        all_btn = CategoryToggleButton(
+            text='전체 포함' if categories is None else f'전체 포함 ({categories.count():,})'
+        )
         all_btn.bind(on_press=lambda x: self.select_category('all'))
         if self.selected_category == 'all':
             all_btn.state = 'down'
         category_layout.add_widget(all_btn)
         
         for cat_id, cat_name in CATEGORIES.items():
-            btn = CategoryToggleButton(text=f'{cat_id}. {cat_name}')
+            text = f'{cat_id}. {cat_name}'
+            if categories is not None:
+                text += f' ({categories.count(cat_id):,})'
+            btn = CategoryToggleButton(text=text)
             btn.bind(on_press=lambda x, cid=cat_id: self.select_category(cid))
             if self.selected_category == cat_id:
                 btn.state = 'down'
@@ -1121,6 +1494,7 @@ class LinkApp(BoxLayout):
         popup.open()
     
     def select_category(self, category_id):
+        """분류 선택 - 검색식에 cat: 조건을 더해 분류 색인으로 다시 찾음"""
         self.selected_category = category_id
         if category_id == 'all':
             self.category_btn.text = '전체포함'
@@ -1132,10 +1506,56 @@ class LinkApp(BoxLayout):
                 child.dismiss()
                 break
         
-        self.refresh_link_list()
+        self.search_links(None)
     
     def setup_link_list(self):
+        self.loading_label = Label(
+            text='',
+            size_hint_y=None,
+            height=0,
+            color=hex_to_rgb(COLORS['text_secondary']),
+            font_size=dp(13),
+            font_name=get_font_name()
+        )
+        self.add_widget(self.loading_label)
+        
+        if LIST_MODE == 'recycle':
+            self.empty_label = Label(
+                text='',
+                size_hint_y=None,
+                height=0,
+                color=hex_to_rgb(COLORS['text_secondary']),
+                font_size=dp(16),
+                halign='center',
+                font_name=get_font_name()
+            )
+            self.add_widget(self.empty_label)
+            self.link_list = LinkList(self)
+            self.add_widget(self.link_list)
+            return
+        
+        self.card_pool = CardPool(self.delete_link, self.edit_link, self.max_cards)
+        font_name = get_font_name()
+        self.more_btn = Button(
+            text='더 보기...',
+            size_hint_y=None,
+            height=dp(50),
+            background_color=hex_to_rgb(COLORS['primary_light']),
+            font_name=font_name
+        )
+        self.more_btn.bind(on_press=self.load_more)
+        # 위쪽 카드를 뺀 뒤 목록 맨 위에 둠
+        self.first_btn = Button(
+            text='처음부터 보기',
+            size_hint_y=None,
+            height=dp(50),
+            background_color=hex_to_rgb(COLORS['primary_light']),
+            font_name=font_name
+        )
+        self.first_btn.bind(on_press=self.show_first_page)
+        self._appending = False
         self.scroll = ScrollView(do_scroll_x=False)
+        self.scroll.bind(scroll_y=self.on_list_scroll)
         self.link_layout = GridLayout(
             cols=1,
             size_hint_y=None,
@@ -1144,24 +1564,29 @@ class LinkApp(BoxLayout):
         )
         self.link_layout.bind(minimum_height=self.link_layout.setter('height'))
         
+        self.card_builder = CardBuilder(self.card_pool, self.link_layout)
+        
         self.scroll.add_widget(self.link_layout)
         self.add_widget(self.scroll)
     
     def refresh_link_list(self, dt=None):
+        if LIST_MODE == 'recycle':
+            self.refresh_link_rows()
+            return
         font_name = get_font_name()
         
+        # 지금 카드들은 모아 두었다가 아래에서 다른 링크로 다시 씀
+        self.card_builder.cancel()
+        self._appending = False
+        self.card_pool.release(self.link_layout.children)
         self.link_layout.clear_widgets()
-        self.link_layout.height = 0
-        
-        links_to_display = self.displayed_links if self.search_mode else self.links
         
-        if self.selected_category != 'all':
-            links_to_display = [link for link in links_to_display if link.get('category', '0') == self.selected_category]
+        # 분류 선택은 검색식의 cat: 조건으로 걸러져 displayed_links 에 들어 있음
+        links_to_display = self.page_source()
         
         if not links_to_display:
-            empty_text = '검색 결과가 없습니다.' if self.search_mode else '저장된 링크가 없습니다.\n"새 링크 추가" 버튼을 눌러 추가하세요!'
             empty_label = Label(
-                text=empty_text,
+                text=self.empty_text(),
                 size_hint_y=None,
                 height=dp(100),
                 color=hex_to_rgb(COLORS['text_secondary']),
@@ -1170,61 +1595,174 @@ class LinkApp(BoxLayout):
                 font_name=font_name
             )
             self.link_layout.add_widget(empty_label)
-            self.link_layout.height += dp(100)
         else:
-            start = self.current_page * self.page_size
-            end = min(start + self.page_size, len(links_to_display))
-            page_links = links_to_display[start:end]
+            # 더 보기로 늘어난 범위도 다시 그림 (카드 수는 max_cards 개까지)
+            end = min((self.current_page + 1) * self.page_size, len(links_to_display))
+            start = max(0, end - self.max_cards)
+            if start > 0:
+                self.link_layout.add_widget(self.first_btn)
+            
+            def done():
+                if end < len(links_to_display):
+                    self.link_layout.add_widget(self.more_btn)
+                self.on_cards_built()
             
-            for i, link in enumerate(page_links):
-                original_index = self.links.index(link) if link in self.links else (start + i)
-                card = LinkCard(
-                    link['title'], 
-                    link['description'], 
-                    link['url'], 
-                    link.get('category', '0'),
-                    original_index, 
-                    self.delete_link, 
-                    self.edit_link
-                )
-                self.link_layout.add_widget(card)
-                Clock.schedule_once(lambda dt, c=card: self.update_card_height(c), 0.2)
+            # 카드는 프레임마다 나눠 만듦 - 높이는 만들 때 글자 크기로 정해짐
+            self.scroll.scroll_y = 1
+            self.card_builder.start(links_to_display[start:end], self.on_cards_built, done)
+            return
+        
+        # 목록 높이는 한 번에 정함 (minimum_height 도 다음 배치 때 같은 값이 됨)
+        self.link_layout.height = self.list_height()
+        self.scroll.scroll_y = 1
+    
+    def on_cards_built(self):
+        """카드를 한 조각 붙인 뒤 - 목록 높이를 맞추고 보던 자리 (목록 맨 위에서의 거리) 를 유지"""
+        top_offset = self.list_top_offset()
+        self.link_layout.height = self.list_height()
+        self.restore_list_scroll(top_offset)
+    
+    def list_height(self):
+        """'pages' 목록 (GridLayout) 에 든 위젯들의 높이 합 - 간격과 여백 포함"""
+        layout = self.link_layout
+        children = layout.children
+        height = layout.padding[1] + layout.padding[3]
+        if children:
+            height += sum(child.height for child in children) + layout.spacing[1] * (len(children) - 1)
+        return height
+    
+    def page_source(self):
+        """'pages' 목록에 보여 줄 링크 순서"""
+        return self.displayed_links if self.search_mode else self.plain_links()
+    
+    def append_link_page(self):
+        """다음 페이지 카드만 만들어 목록 끝에 붙임 - 보던 자리는 그대로 둠
+        
+        카드가 max_cards 개를 넘으면 맨 위 카드부터 빼서 카드 모음에 돌려줌.
+        """
+        links = self.page_source()
+        start = self.current_page * self.page_size
+        end = min(start + self.page_size, len(links))
+        layout = self.link_layout
+        if self.more_btn.parent is not None:
+            layout.remove_widget(self.more_btn)
+        
+        def done():
+            top_offset = self.list_top_offset()
+            cards = [widget for widget in reversed(layout.children) if isinstance(widget, LinkCard)]
+            excess = len(cards) - self.max_cards
+            if excess > 0:
+                dropped = cards[:excess]
+                top_offset -= sum(card.height for card in dropped) + layout.spacing[1] * excess
+                for card in dropped:
+                    layout.remove_widget(card)
+                self.card_pool.release(dropped)
+                if self.first_btn.parent is None:
+                    layout.add_widget(self.first_btn, index=len(layout.children))
+                    top_offset += self.first_btn.height + layout.spacing[1]
             
-            if end < len(links_to_display):
-                more_btn = Button(
-                    text='더 보기...',
-                    size_hint_y=None,
-                    height=dp(50),
-                    background_color=hex_to_rgb(COLORS['primary_light']),
-                    font_name=font_name
-                )
-                more_btn.bind(on_press=self.load_more)
-                self.link_layout.add_widget(more_btn)
-                self.link_layout.height += dp(50)
-        
-        Clock.schedule_once(lambda dt: setattr(self.scroll, 'scroll_y', 1), 0.1)
+            if end < len(links):
+                layout.add_widget(self.more_btn)
+            layout.height = self.list_height()
+            self.restore_list_scroll(max(top_offset, 0))
+            self._appending = False
+        
+        # 아래에 붙이는 카드는 목록 맨 위에서 화면까지의 거리를 바꾸지 않음 - 조각마다 그 거리를 유지
+        self.card_builder.start(links[start:end], self.on_cards_built, done)
+    
+    def list_top_offset(self):
+        """목록 맨 위에서 화면 맨 위까지의 거리"""
+        return (1 - self.scroll.scroll_y) * max(self.link_layout.height - self.scroll.height, 0)
+    
+    def restore_list_scroll(self, top_offset):
+        """목록 맨 위에서 화면 맨 위까지의 거리가 top_offset 이 되게 스크롤"""
+        scrollable = self.link_layout.height - self.scroll.height
+        if scrollable > 0:
+            self.scroll.scroll_y = min(max(1 - top_offset / scrollable, 0), 1)
+    
+    def on_list_scroll(self, instance, scroll_y):
+        """목록 끝까지 내리면 더 보기"""
+        if scroll_y <= 0 and not self._appending and self.more_btn.parent is not None:
+            self.load_more(None)
+    
+    def show_first_page(self, instance):
+        self.current_page = 0
+        self.refresh_link_list()
+    
+    def refresh_link_rows(self, scroll_top=True):
+        """RecycleView 목록 갱신 - 줄 수만 맞추고, 각 줄은 화면에 보일 때 row_link() 로 채움"""
+        links = self.displayed_links if self.search_mode else self.plain_links()
+        self._row_links = links
+        if links:
+            self.empty_label.text = ''
+            self.empty_label.height = 0
+        else:
+            self.empty_label.text = self.empty_text()
+            self.empty_label.height = dp(100)
+        self.link_list.show(len(links), scroll_top)
+    
+    def row_link(self, index):
+        """목록 줄 index 에 채울 링크 - 아직 순서를 정하지 않은 곳이면 한 페이지 분량 더 정함"""
+        self.rank_through(index + self.page_size)
+        return self._row_links[index]
+    
+    def empty_text(self):
+        if self.search_mode:
+            return '검색 결과가 없습니다.'
+        return '저장된 링크가 없습니다.\n"새 링크 추가" 버튼을 눌러 추가하세요!'
     
     def load_more(self, instance):
         self.current_page += 1
-        self.refresh_link_list()
+        self.rank_more()
+        self._appending = True
+        self.append_link_page()
+    
+    def on_search_text(self, instance, text):
+        """입력하는 동안 검색 (마지막 입력 후 search_delay 초 뒤 한 번)"""
+        if self._search_event is not None:
+            self.clock_manager.cancel_event(self._search_event)
+        self._search_event = self.clock_manager.schedule_once(self.live_search, self.search_delay)
     
-    def update_card_height(self, card):
-        self.link_layout.height += card.height
+    def live_search(self, dt=None):
+        self._search_event = None
+        self.search_links(None)
     
     def search_links(self, instance):
-        """개선된 검색 메서드 (SearchParser 사용)"""
+        """개선된 검색 메서드 (SearchParser 사용)
+
+        색인/비트맵 검색은 작업 스레드에서 하고 (start_search) 결과는 on_search_done 에서
+        반영한다. 새 검색식이 이전 검색식을 좁히기만 하면 (검색어를 이어 쓰거나 AND 를
+        덧붙인 경우) 전체 목록 대신 이전 검색 결과만 다시 검사한다. 결과가 없으면 일치하는
+        링크가 없던 검색어를 오타 허용 검색어 (~검색어) 로 바꿔 다시 찾는다.
+        """
         search_text = self.search_input.text.strip()
         self.current_page = 0
+        # 진행 중인 검색은 이 검색으로 대체됨
+        self.cancel_search()
         
         try:
-            search_func = SearchParser.parse(search_text)
+            postfix = self.search_postfix()
+            search_func = SearchParser.compile(postfix)
+            last = self._last_search
+            self._last_search = None
+            self._fuzzy_postfix = None
             
-            if not search_text:
-                self.displayed_links = self.links.copy()
+            if not search_text and self.selected_category == 'all':
+                # 검색하지 않을 때는 plain_links() 를 읽으므로 목록을 복사하지 않음
+                self.displayed_links = []
                 self.search_mode = False
-            else:
-                self.displayed_links = [link for link in self.links if search_func(link)]
+            elif self.ids_pending:
+                # 읽는 중 (또는 읽기 실패) 에는 임시 id 가 섞여 있으므로 링크별 검사
+                views = self.views
+                self.displayed_links = [link for link in self.links if search_func(views(link))]
                 self.search_mode = True
+            else:
+                pool = None
+                if (not self.storage.supports_query and last is not None and self.search_mode and
+                        SearchParser.narrows(last, postfix)):
+                    pool = list(self.displayed_links)
+                self.start_search(postfix, pool)
+                return
             
             self.sort_links(self.current_sort)
             
@@ -1233,44 +1771,328 @@ class LinkApp(BoxLayout):
             # 오류 발생 시 기본 검색으로 폴백
             self.fallback_search(search_text)
     
+    def start_search(self, postfix, pool=None):
+        """작업 스레드에서 검색 - 지금 목록의 스냅샷으로 거르고 정렬까지 함
+
+        SQLite 저장소는 저장소 질의로 거른다 (대기 중인 기록을 마칠 때까지 작업 스레드에서 기다림).
+        정렬은 메모리의 대조 키로 - SQL 의 lower() 순서와 다름.
+        """
+        query = self.storage.query_ids if self.storage.supports_query else None
+        job = SearchJob(postfix, self.search_snapshot(), self.get_search_index(), self.categories,
+                        self.current_sort, self.page_size, pool, query=query)
+        self.run_search_job(job)
+    
+    def run_search_job(self, job):
+        self._search_job = job
+        self.set_search_busy(True)
+        
+        def run():
+            error = None
+            try:
+                done = job.run()
+            except Exception as e:
+                done = False
+                error = e
+            if done or error is not None:
+                self.on_search_done(job, error)
+        
+        threading.Thread(target=run, name='SearchWorker', daemon=True).start()
+    
+    @mainthread
+    def on_search_done(self, job, error=None):
+        if job is not self._search_job:
+            # 취소됐거나 더 새 검색이 시작됨 - 오래된 결과로 덮어쓰지 않음
+            return
+        self._search_job = None
+        self.set_search_busy(False)
+        if error is not None:
+            Logger.error(f'검색 중 오류: {error}')
+            if job.reorder:
+                # 결과는 그대로 두고 정렬만 포기 (폴백 검색이 다시 정렬을 시작하지 않도록)
+                self._ranking = None
+                self.refresh_link_list()
+            else:
+                self.fallback_search(self.search_input.text.strip())
+            return
+        
+        self.displayed_links = self.links_by_ids(job.ids)
+        self.search_mode = True
+        self.current_page = 0
+        self._fuzzy_postfix = job.fuzzy_postfix
+        self._ranking = None
+        if job.ranking is not None:
+            # 힙은 작업 스레드에서 만든 것을 그대로 쓰고, 키를 다시 구할 때는 UI 의 보기로
+            key = job.scorer.key(self.views) if job.scorer is not None else self.sort_key(job.sort)[0]
+            self._ranking = job.ranking.attach(self.displayed_links, key)
+        # 정렬만 다시 한 결과면 (reorder) 이전 결과를 좁혀 쓸 수 있는지는 그대로
+        if not job.reorder:
+            if job.fuzzy_postfix is not None:
+                Logger.info(f'검색 결과가 없어 오타 허용 검색: {" ".join(job.fuzzy_postfix)}')
+            elif job.snapshot.version == self._data_version:
+                # 검색하는 동안 목록이 바뀌지 않았을 때만 다음 검색이 이 결과를 좁혀 쓸 수 있음
+                self._last_search = job.postfix
+        
+        if job.sort != self.current_sort:
+            # 검색하는 동안 정렬 버튼을 누름
+            self.sort_links(self.current_sort)
+        else:
+            self.refresh_link_list()
+    
+    def cancel_search(self):
+        if self._search_job is not None:
+            self._search_job.cancel()
+            self._search_job = None
+            self.set_search_busy(False)
+    
+    def set_search_busy(self, busy):
+        """검색 중 표시 (검색 버튼 글자)"""
+        if hasattr(self, 'search_btn'):
+            self.search_btn.text = '검색 중' if busy else '검색'
+    
+    def search_snapshot(self):
+        """검색 작업에 넘길 스냅샷 - 목록이 바뀌었을 때만 새로 만듦
+
+        LinkView 는 이전 스냅샷 것을 물려받고 바뀐 링크 것만 버린다.
+        """
+        snapshot = self._search_snapshot
+        if snapshot is None or snapshot.version != self._data_version:
+            views = snapshot.views.copy() if snapshot is not None else self.views.copy()
+            for link_id in self._changed_ids:
+                views.discard(link_id)
+            self._changed_ids = set()
+            snapshot = self._search_snapshot = SearchSnapshot(
+                frozen_links(self.links), views, build_id_map, self._data_version
+            )
+        return snapshot
+    
+    def get_search_index(self):
+        """검색 색인 - 아직 없으면 백그라운드에서 만들기 시작하고 None (그동안은 순차 검사)"""
+        if self.ids_pending:
+            return None
+        if self.search_index is not None and self.search_index.needs_rebuild():
+            self.search_index = None
+        if self.search_index is None and self._index_pending is None:
+            self.start_index_build()
+        return self.search_index
+    
+    def start_index_build(self):
+        """현재 목록의 복사본으로 색인을 만들고, 만드는 동안의 변경은 모아 두었다가 적용"""
+        pending = self._index_pending = []
+        links = frozen_links(self.links)
+        
+        def build():
+            try:
+                index = BigramIndex.build(links)
+            except Exception as e:
+                Logger.error(f'검색 색인 생성 실패: {e}')
+                index = None
+            self.on_index_built(index, pending)
+        
+        threading.Thread(target=build, name='SearchIndexBuilder', daemon=True).start()
+    
+    @mainthread
+    def on_index_built(self, index, pending):
+        if pending is not self._index_pending:
+            # 그 사이 목록을 다시 읽었으면 버림
+            return
+        self._index_pending = None
+        if index is None:
+            return
+        for op, link in pending:
+            self.apply_index_change(index, op, link)
+        self.search_index = index
+    
+    def index_link(self, op, link):
+        """추가/수정/삭제를 검색 보기/분류/정렬 목록/색인에 반영 (색인을 만드는 중이면 완료 후 적용)"""
+        if op == 'delete':
+            self.views.discard(link['id'])
+        else:
+            self.views.refresh(link)
+        # 목록이 바뀌면 이전 검색 결과를 좁혀 쓸 수 없고, 검색 스냅샷도 새로 만들어야 함
+        self._last_search = None
+        self._data_version += 1
+        self._changed_ids.add(link['id'])
+        if self.categories is not None:
+            self.apply_index_change(self.categories, op, link)
+        if op == 'update' and self._ranking is not None:
+            # 수정된 링크의 키가 바뀌었을 수 있음 - 남은 뒤쪽은 다음 페이지 때 키를 다시 구함
+            self._ranking.invalidate()
+        if self.sorted_orders is not None:
+            self.apply_index_change(self.sorted_orders, op, link)
+        if self._orders_pending is not None:
+            self._orders_pending.append((op, link))
+        if self._index_pending is not None:
+            self._index_pending.append((op, link))
+        if self.search_index is not None:
+            self.apply_index_change(self.search_index, op, link)
+    
+    @staticmethod
+    def apply_index_change(index, op, link):
+        if op == 'add':
+            index.add(link)
+        elif op == 'update':
+            index.update(link)
+        elif op == 'delete':
+            index.remove(link['id'])
+    
+    def search_postfix(self):
+        """현재 검색어의 후위 표기 토큰 (분류를 골랐으면 cat: 조건을 AND 로 덧붙임)"""
+        postfix = SearchParser.postfix(self.search_input.text)
+        if self.selected_category != 'all':
+            postfix = SearchParser.conjoin(postfix, f'cat:{self.selected_category}')
+        return postfix
+    
+    def refresh_after_edit(self):
+        """추가/수정 뒤 목록 갱신 - 분류를 골랐으면 다시 걸러서 바뀐 분류가 바로 반영되게 함
+
+        분류 조건은 검색식의 cat: 으로 검색할 때만 적용되므로 검색어가 있어도 다시 찾는다.
+        """
+        if self.selected_category != 'all':
+            self.search_links(None)
+        else:
+            self.refresh_edited_list()
+    
+    def refresh_edited_list(self):
+        """추가/수정/삭제 뒤 다시 그림 - RecycleView 목록은 보던 자리 그대로 (줄 수가 같으면 보이는 줄만)"""
+        if LIST_MODE == 'recycle':
+            self.refresh_link_rows(scroll_top=False)
+        else:
+            self.refresh_link_list()
+    
+    def links_by_ids(self, link_ids):
+        """저장소 질의 결과 id 를 메모리의 레코드로 변환"""
+        link_map = self.link_map
+        return [link_map[link_id] for link_id in link_ids if link_id in link_map]
+    
     def fallback_search(self, search_text):
-        """기본 검색 (폴백)"""
-        search_text_lower = search_text.lower()
+        """기본 검색 (폴백) - 검색어를 부분 문자열로 찾고 고른 분류만 남김"""
+        search_text_lower = fold(search_text)
+        category = self.selected_category
         self.displayed_links = []
         
         for link in self.links:
-            if (search_text_lower in link['title'].lower() or 
-                search_text_lower in link['description'].lower() or 
-                search_text_lower in link['url'].lower()):
+            if category != 'all' and link.get('category', '0') != category:
+                continue
+            view = self.views(link)
+            if (search_text_lower in view.title or 
+                search_text_lower in view.description or 
+                search_text_lower in view.url):
                 self.displayed_links.append(link)
         
         self.search_mode = True
         self.sort_links(self.current_sort)
     
     def clear_search(self, instance):
+        self.cancel_search()
         self.search_input.text = ''
+        if self._search_event is not None:
+            self.clock_manager.cancel_event(self._search_event)
+            self._search_event = None
         self.selected_category = 'all'
         self.category_btn.text = '전체포함'
         self.search_mode = False
+        self.displayed_links = []
         self.current_page = 0
         self.refresh_link_list()
     
     def sort_links(self, sort_type):
+        """정렬 방식 변경 - 제목/주소 순은 미리 정렬해 둔 목록 (SortedOrders) 을 읽으므로
+        다시 정렬하지 않고, self.links (저장 순서) 도 건드리지 않는다.
+
+        검색 결과는 작업 스레드에서 키 (점수) 를 구해 첫 페이지 분량만 순서를 정하고
+        (start_reorder), 나머지는 보일 때 힙에서 꺼낸다 (rank_through)."""
         self.current_sort = sort_type
-        links_to_sort = self.displayed_links if self.search_mode else self.links
         self.current_page = 0
         
-        if sort_type == 'title_asc':
-            links_to_sort.sort(key=lambda x: x['title'].lower())
-        elif sort_type == 'title_desc':
-            links_to_sort.sort(key=lambda x: x['title'].lower(), reverse=True)
-        elif sort_type == 'url_asc':
-            links_to_sort.sort(key=lambda x: x['url'].lower())
-        elif sort_type == 'url_desc':
-            links_to_sort.sort(key=lambda x: x['url'].lower(), reverse=True)
+        if not self.search_mode:
+            self._ranking = None
+            self.get_sorted_orders()
+        elif self._search_job is not None:
+            # 검색 중 - 끝나면 on_search_done 이 바뀐 정렬 방식으로 다시 정렬함
+            return
+        elif not self.ids_pending:
+            self.start_reorder()
+            return
+        elif sort_type == 'relevance':
+            # 읽는 중에는 임시 id 가 섞여 있음 - 다 읽으면 다시 검색하므로 그때 매김
+            self._ranking = None
+        else:
+            key, reverse = self.sort_key(sort_type)
+            self._ranking = RankedResults(self.displayed_links, key, reverse)
+            self._ranking.rank_through(self.page_size)
         
         self.refresh_link_list()
     
+    def start_reorder(self):
+        """지금 검색 결과의 정렬만 작업 스레드에서 다시 함 (다시 거르지 않음)"""
+        postfix = self.search_postfix()
+        job = SearchJob(postfix, self.search_snapshot(), self.get_search_index(), self.categories,
+                        self.current_sort, self.page_size, list(self.displayed_links), reorder=True,
+                        fuzzy_postfix=self._fuzzy_postfix)
+        self.run_search_job(job)
+    
+    def get_sorted_orders(self):
+        """제목/주소 정렬 목록 - 아직 없으면 백그라운드에서 만들기 시작하고 None (그동안은 저장 순서)"""
+        if self.sorted_orders is None and self._orders_pending is None and not self.ids_pending:
+            self.start_orders_build()
+        return self.sorted_orders
+    
+    def start_orders_build(self):
+        """현재 목록의 복사본으로 정렬 목록을 만들고, 만드는 동안의 변경은 모아 두었다가 적용
+
+        키는 (id, 제목, 주소) 로 바로 만든다 - 바이너리 스냅샷의 지연 목록은 레코드를 디코딩하지
+        않고 문자열만 읽으므로 (link_sort_fields) 시작 때 모든 레코드가 dict 로 풀리지 않는다.
+        """
+        pending = self._orders_pending = []
+        links = frozen_links(self.links)
+        
+        def build():
+            try:
+                orders = SortedOrders.build(link_sort_fields(links), self.views)
+            except Exception as e:
+                Logger.error(f'정렬 목록 생성 실패: {e}')
+                orders = None
+            self.on_orders_built(orders, pending)
+        
+        threading.Thread(target=build, name='SortedOrdersBuilder', daemon=True).start()
+    
+    @mainthread
+    def on_orders_built(self, orders, pending):
+        if pending is not self._orders_pending:
+            # 그 사이 목록을 다시 읽었으면 버림
+            return
+        self._orders_pending = None
+        if orders is None:
+            return
+        for op, link in pending:
+            self.apply_index_change(orders, op, link)
+        self.sorted_orders = orders
+        if not self.search_mode and self.current_sort in SORT_KEYS:
+            self.refresh_link_list()
+    
+    def sort_key(self, sort_type):
+        """검색 결과를 정렬할 (키 함수, 내림차순 여부) - 정렬 목록이 있으면 저장해 둔 키를 씀"""
+        if self.sorted_orders is not None:
+            return self.sorted_orders.key(sort_type)
+        field, reverse = SORT_KEYS[sort_type]
+        views = self.views
+        return (lambda link: (views(link).collation(field), link['id'])), reverse
+    
+    def plain_links(self):
+        """검색하지 않을 때 보여 줄 목록 - 정렬 목록이 있으면 정렬 방식 순으로 그대로 읽음"""
+        if self.sorted_orders is not None and self.current_sort in SORT_KEYS:
+            return self.sorted_orders.links(self.current_sort, self.link_map)
+        return self.links
+    
+    def rank_more(self):
+        """더 보기 - 보여 줄 범위가 순서를 정한 앞부분을 넘으면 다음 페이지 분량을 더 정함"""
+        self.rank_through((self.current_page + 1) * self.page_size)
+    
+    def rank_through(self, end):
+        """검색 결과의 앞 end 개까지 순서를 정함 (이미 정했으면 그대로, 모자란 만큼만 힙에서 꺼냄)"""
+        if self.search_mode and self._ranking is not None:
+            self._ranking.rank_through(end)
+    
     @lru_cache(maxsize=128)
     def normalize_url(self, url):
         url = url.strip().lower()
@@ -1280,12 +2102,12 @@ class LinkApp(BoxLayout):
     
     def check_duplicate_url(self, url):
         normalized_url = self.normalize_url(url)
-        duplicate_indices = []
-        for i, link in enumerate(self.links):
+        duplicate_ids = []
+        for link in self.links:
             existing_url = self.normalize_url(link['url'])
             if existing_url == normalized_url:
-                duplicate_indices.append(i)
-        return duplicate_indices
+                duplicate_ids.append(link['id'])
+        return duplicate_ids
     
     def count_duplicate_urls(self, url):
         normalized_url = self.normalize_url(url)
@@ -1296,12 +2118,12 @@ class LinkApp(BoxLayout):
                 count += 1
         return count
     
-    def show_duplicate_popup(self, title, description, url, category, duplicate_indices):
+    def show_duplicate_popup(self, title, description, url, category, duplicate_ids):
         content = BoxLayout(orientation='vertical', spacing=dp(15), padding=dp(20))
         content.size_hint = (1, 1)
         
         font_name = get_font_name()
-        current_duplicates = len(duplicate_indices)
+        current_duplicates = len(duplicate_ids)
         
         if current_duplicates >= 2:
             content.add_widget(Label(
@@ -1331,7 +2153,7 @@ class LinkApp(BoxLayout):
             return
         
         content.add_widget(Label(
-            text=f'이미 등록된 주소입니다:\n{self.links[duplicate_indices[0]]["title"]}',
+            text=f'이미 등록된 주소입니다:\n{self.link_map[duplicate_ids[0]]["title"]}',
             color=hex_to_rgb(COLORS['white']),
             font_size=dp(16),
             size_hint_y=None,
@@ -1363,8 +2185,7 @@ class LinkApp(BoxLayout):
             popup.dismiss()
         
         def replace_link(btn):
-            for index in sorted(duplicate_indices, reverse=True):
-                del self.links[index]
+            self.remove_links(duplicate_ids)
             self.add_link(title, description, url, category)
             popup.dismiss()
         
@@ -1482,10 +2303,10 @@ class LinkApp(BoxLayout):
             
             if title and url:
                 normalized_url = self.normalize_url(url)
-                duplicate_indices = self.check_duplicate_url(normalized_url)
-                if duplicate_indices:
+                duplicate_ids = self.check_duplicate_url(normalized_url)
+                if duplicate_ids:
                     popup.dismiss()
-                    self.show_duplicate_popup(title, description, normalized_url, self.selected_category_id, duplicate_indices)
+                    self.show_duplicate_popup(title, description, normalized_url, self.selected_category_id, duplicate_ids)
                 else:
                     self.add_link(title, description, normalized_url, self.selected_category_id)
                     popup.dismiss()
@@ -1570,12 +2391,12 @@ class LinkApp(BoxLayout):
         self.category_select_btn.text = f'{category_id}. {CATEGORIES[category_id]}'
         popup.dismiss()
     
-    def edit_link(self, index):
+    def edit_link(self, link_id):
         """링크 수정 팝업 (KeyboardAwarePopup 사용)"""
-        if index < 0 or index >= len(self.links):
+        link = self.link_map.get(link_id)
+        if link is None:
             return
         
-        link = self.links[index]
         font_name = get_font_name()
         
         content = BoxLayout(
@@ -1729,18 +2550,18 @@ class LinkApp(BoxLayout):
             if new_title and new_url:
                 normalized_url = self.normalize_url(new_url)
                 
-                duplicate_indices = []
-                for i, existing_link in enumerate(self.links):
-                    if i != index:
+                duplicate_ids = []
+                for existing_link in self.links:
+                    if existing_link['id'] != link_id:
                         existing_url = self.normalize_url(existing_link['url'])
                         if existing_url == normalized_url:
-                            duplicate_indices.append(i)
+                            duplicate_ids.append(existing_link['id'])
                 
-                if duplicate_indices:
+                if duplicate_ids:
                     popup.dismiss()
-                    self.show_edit_duplicate_popup(new_title, new_description, normalized_url, edit_selected_category, index, duplicate_indices)
+                    self.show_edit_duplicate_popup(new_title, new_description, normalized_url, edit_selected_category, link_id, duplicate_ids)
                 else:
-                    self.update_link(index, new_title, new_description, normalized_url, edit_selected_category)
+                    self.update_link(link_id, new_title, new_description, normalized_url, edit_selected_category)
                     popup.dismiss()
         
         def cancel_edit(btn):
@@ -1763,11 +2584,11 @@ class LinkApp(BoxLayout):
         popup.open()
         Clock.schedule_once(lambda dt: setattr(title_input, 'focus', True), 0.2)
     
-    def show_edit_duplicate_popup(self, title, description, url, category, edit_index, duplicate_indices):
+    def show_edit_duplicate_popup(self, title, description, url, category, edit_id, duplicate_ids):
         content = BoxLayout(orientation='vertical', spacing=dp(15), padding=dp(20))
         
         font_name = get_font_name()
-        current_duplicates = len(duplicate_indices)
+        current_duplicates = len(duplicate_ids)
         
         if current_duplicates >= 2:
             content.add_widget(Label(
@@ -1796,7 +2617,7 @@ class LinkApp(BoxLayout):
             return
         
         content.add_widget(Label(
-            text=f'다른 항목에 같은 주소가 있습니다:\n{self.links[duplicate_indices[0]]["title"]}',
+            text=f'다른 항목에 같은 주소가 있습니다:\n{self.link_map[duplicate_ids[0]]["title"]}',
             color=hex_to_rgb(COLORS['white']),
             font_size=dp(16),
             size_hint_y=None,
@@ -1820,20 +2641,15 @@ class LinkApp(BoxLayout):
         keep_btn, cancel_btn, replace_btn = button_layout.children
         
         def keep_original(btn):
-            self.update_link(edit_index, title, description, url, category)
+            self.update_link(edit_id, title, description, url, category)
             popup.dismiss()
         
         def cancel_edit(btn):
             popup.dismiss()
         
         def replace_and_edit(btn):
-            for index in sorted(duplicate_indices, reverse=True):
-                del self.links[index]
-            adjusted_index = edit_index
-            for dup_index in duplicate_indices:
-                if dup_index < edit_index:
-                    adjusted_index -= 1
-            self.update_link(adjusted_index, title, description, url, category)
+            self.remove_links(duplicate_ids)
+            self.update_link(edit_id, title, description, url, category)
             popup.dismiss()
         
         keep_btn.bind(on_press=keep_original)
@@ -1850,24 +2666,30 @@ class LinkApp(BoxLayout):
         )
         popup.open()
     
-    def update_link(self, index, title, description, url, category):
-        if 0 <= index < len(self.links):
-            self.links[index] = {
+    def update_link(self, link_id, title, description, url, category):
+        link = self.link_map.get(link_id)
+        if link is not None:
+            # 제자리에서 고치므로 목록/검색 결과의 순서와 참조가 그대로 유지됨
+            link.update({
                 'title': title,
                 'description': description,
                 'url': url,
                 'category': category
-            }
-            self.save_links()
-            self.refresh_link_list()
-    
-    def delete_link(self, index):
+            })
+            self.index_link('update', link)
+            self.journal('update', link)
+            self.refresh_after_edit()
+    
+    def delete_link(self, link_id):
+        link = self.link_map.get(link_id)
+        if link is None:
+            return
         content = BoxLayout(orientation='vertical', spacing=dp(15), padding=dp(20))
         
         font_name = get_font_name()
         
         content.add_widget(Label(
-            text=f'"{self.links[index]["title"]}" 링크를 삭제하시겠습니까?',
+            text=f'"{link["title"]}" 링크를 삭제하시겠습니까?',
             color=hex_to_rgb(COLORS['white']),
             font_size=dp(16),
             size_hint_y=None,
@@ -1881,10 +2703,9 @@ class LinkApp(BoxLayout):
         delete_btn = Button(text='삭제', background_color=hex_to_rgb(COLORS['danger']), font_name=font_name)
         
         def confirm_delete(btn):
-            if 0 <= index < len(self.links):
-                del self.links[index]
-                self.save_links()
-                self.refresh_link_list()
+            if link_id in self.link_map:
+                self.remove_links([link_id])
+                self.refresh_edited_list()
             popup.dismiss()
         
         def cancel_delete(btn):
@@ -1906,23 +2727,100 @@ class LinkApp(BoxLayout):
         popup.open()
     
     def add_link(self, title, description, url, category):
+        if self.ids_pending:
+            # 읽기가 끝나야 다음 id 를 알 수 있으므로 임시 id 를 쓰고 완료 시 바꿈
+            self._temp_id -= 1
+            link_id = self._temp_id
+        else:
+            link_id = self.storage.new_id()
         new_link = {
+            'id': link_id,
             'title': title,
             'description': description,
             'url': url,
             'category': category
         }
         self.links.append(new_link)
-        self.save_links()
-        self.refresh_link_list()
+        self.link_map[link_id] = new_link
+        self.index_link('add', new_link)
+        self.journal('add', new_link)
+        self.refresh_after_edit()
+    
+    def remove_links(self, link_ids):
+        """여러 링크 삭제 (id 로 찾아 목록과 검색 결과에서 제거)"""
+        for link_id in link_ids:
+            link = self.link_map.pop(link_id, None)
+            if link is None:
+                continue
+            self.links.remove(link)
+            if self.search_mode:
+                if self._ranking is not None:
+                    # 순서를 아직 정하지 않은 뒤쪽이면 자리만 메움 (앞부분에서 빠지면 그만큼 짧아짐)
+                    self._ranking.remove(link)
+                elif link in self.displayed_links:
+                    self.displayed_links.remove(link)
+            self.index_link('delete', link)
+            self.journal('delete', link)
+    
+    def journal(self, op, link):
+        """변경 사항을 저널에 기록하고, 쌓이면 백그라운드에서 스냅샷으로 압축
+
+        실제 파일 기록은 저장 스레드가 하므로 여기서는 요청만 넣는다.
+        """
+        if self.ids_pending:
+            # 읽기가 끝나 id 가 확정되면 on_links_loaded 에서 기록 (그 전에 종료하면 write_pending_ops)
+            # 수정은 고친 값을 복사해 둠 - 읽기 스레드의 저널 재생이 같은 레코드를 고칠 수 있음
+            self._ops_during_load.append((op, dict(link) if op == 'update' else link))
+            return
+        start = time.perf_counter()
+        try:
+            if op == 'add':
+                self.storage.log_add(link)
+            elif op == 'update':
+                self.storage.log_update(link)
+            elif op == 'delete':
+                self.storage.log_delete(link['id'])
+            
+            if self.storage.should_compact():
+                self.storage.compact_async(self.links)
+        except Exception as e:
+            Logger.error(f'저널 기록 실패: {e}')
+        self.save_stats.add(time.perf_counter() - start)
     
     def save_links(self):
+        """대기 중인 저널 기록을 마치고 끝날 때까지 대기 (종료 시)
+
+        수정 사항은 이미 저널에 있으므로 전체 목록을 다시 쓰지 않는다 - 압축은 저널이
+        COMPACT_THRESHOLD 만큼 쌓였을 때만 (journal). SQLite 저장소의 links.json
+        내보내기도 같은 압축 요청으로만 일어난다.
+        """
         try:
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(self.links, f, ensure_ascii=False, indent=2)
+            if self.ids_pending:
+                self.write_pending_ops()
+            self.storage.flush()
         except Exception as e:
             Logger.error(f'링크 저장 실패: {e}')
 
+    def write_pending_ops(self):
+        """읽기가 끝나지 않았거나 실패한 채로 종료할 때 보류한 수정을 저널에 기록 (압축 없이)
+
+        임시 id 로 추가한 링크는 id 없이 기록해 다음에 읽을 때 새 id 를 받게 하고,
+        그 링크의 수정은 추가 기록에 이미 들어 있으며 삭제한 것은 기록하지 않는다.
+        읽기 스레드는 저널을 처음에 다 읽어 두므로 읽는 중에 기록해도 다음 시작 때 재생된다.
+        """
+        ops, self._ops_during_load = self._ops_during_load, []
+        for op, link in ops:
+            if link['id'] >= 0:
+                if op == 'delete':
+                    self.storage.log_delete(link['id'])
+                elif op == 'add':
+                    self.storage.log_add(link)
+                else:
+                    self.storage.log_update(link)
+            elif op == 'add' and link['id'] in self.link_map:
+                self.storage.log_add({key: value for key, value in link.items() if key != 'id'})
+        Logger.info(f'저장: 읽기 완료 전 수정 {len(ops)}건을 저널에 기록')
+
 # ============================================================
 # 앱 실행
 # ============================================================